@@ -11,11 +11,13 @@ import json
 import time
 import requests
 from datetime import datetime, timezone
+from operator import itemgetter
 from typing import List, Dict, Tuple
 
 # Config
 WATCHLIST_FILE = "/Users/pterion2910/.openclaw/workspace/config/memecoin_watchlist.json"
 REPORT_FILE = "/Users/pterion2910/.openclaw/workspace/reports/daily_watchlist_report.html"
+DEX_BATCH_SIZE = 30  # DexScreener /tokens/v1 accepts up to 30 addresses per call
 
 def load_watchlist() -> List[Dict]:
     """Load watchlist from JSON file."""
@@ -26,31 +28,68 @@ def load_watchlist() -> List[Dict]:
         print(f"[Error] Could not load watchlist: {e}")
         return []
 
-def fetch_token_data(address: str, chain: str) -> Dict:
-    """Fetch current token data from DexScreener."""
-    try:
-        resp = requests.get(
-            f"https://api.dexscreener.com/tokens/v1/{chain}/{address}",
-            timeout=30
-        )
-        data = resp.json()
-        
-        if isinstance(data, list) and len(data) > 0:
-            pair = data[0]
-            return {
-                'price': float(pair.get('priceUsd', 0)),
-                'market_cap': float(pair.get('marketCap', 0)),
-                'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
-                'change_24h': float(pair.get('priceChange', {}).get('h24', 0)),
-                'liquidity': float(pair.get('liquidity', {}).get('usd', 0)),
-                'pairCreatedAt': pair.get('pairCreatedAt'),
-                'url': pair.get('url', ''),
-                'dex': pair.get('dexId', '')
-            }
-    except Exception as e:
-        print(f"[Error] Fetching {address[:8]}...: {e}")
+def _parse_pair(pair: Dict) -> Dict:
+    """Extract the fields the engines use from a DexScreener pair."""
+    return {
+        'price': float(pair.get('priceUsd', 0)),
+        'market_cap': float(pair.get('marketCap', 0)),
+        'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
+        'change_24h': float(pair.get('priceChange', {}).get('h24', 0)),
+        'liquidity': float(pair.get('liquidity', {}).get('usd', 0)),
+        'pairCreatedAt': pair.get('pairCreatedAt'),
+        'url': pair.get('url', ''),
+        'dex': pair.get('dexId', '')
+    }
+
+def fetch_tokens_data(tokens: List[Dict]) -> Dict[str, Dict]:
+    """
+    Fetch current data for many tokens using DexScreener's bulk endpoint.
+    Addresses are grouped by chain and sent up to DEX_BATCH_SIZE per request.
+    Returns {address: data}; tokens missing from the response are omitted.
+    """
+    by_chain: Dict[str, List[str]] = {}
+    for token in tokens:
+        by_chain.setdefault(token['chain'], []).append(token['address'])
+    
+    results = {}
+    seen = set()
+    for chain, addresses in by_chain.items():
+        # EVM addresses may come back in a different case than the watchlist
+        wanted = {addr.lower(): addr for addr in addresses}
+        for i in range(0, len(addresses), DEX_BATCH_SIZE):
+            batch = addresses[i:i + DEX_BATCH_SIZE]
+            try:
+                resp = requests.get(
+                    f"https://api.dexscreener.com/tokens/v1/{chain}/{','.join(batch)}",
+                    timeout=30
+                )
+                pairs = resp.json()
+            except Exception as e:
+                print(f"[Error] Bulk fetch ({chain}, {len(batch)} tokens): {e}")
+                continue
+            
+            if not isinstance(pairs, list):
+                continue
+            
+            # First pair DexScreener lists for each token
+            for pair in pairs:
+                try:
+                    addr = wanted.get(pair.get('baseToken', {}).get('address', '').lower())
+                except (TypeError, ValueError, AttributeError):
+                    continue
+                if addr and addr not in seen:
+                    seen.add(addr)
+                    # A bad pair leaves just this token out of the results
+                    try:
+                        results[addr] = _parse_pair(pair)
+                    except Exception as e:
+                        print(f"[Error] Fetching {addr[:8]}...: {e}")
     
-    return {}
+    return results
+
+def _clip(value: float, lo: float, hi: float) -> float:
+    """Clamp value into [lo, hi]."""
+    return min(max(value, lo), hi)
 
 def detect_engine_a(change_24h: float, age_days: int, price_vs_high: float = 1.0, volume_trend: str = "neutral", ath_drawdown: float = 0.0, ema50_riding: bool = False) -> Tuple[bool, float, str]:
     """
@@ -113,12 +152,14 @@ def detect_engine_a(change_24h: float, age_days: int, price_vs_high: float = 1.0
     
     # TRUMP/MAGA PATTERN: Parabolic collapse detection (AVOID)
     # If token is down >90% from ATH = dead/rekt token
+    # Penalty ramps linearly from 0 at -50% to -0.8 at -90%
+    score -= _clip((ath_drawdown - 0.5) * 2.0, 0.0, 0.8)
     if ath_drawdown > 0.9:
-        score -= 0.8  # Severe penalty
         signals.append("⚠️ Parabolic collapse (-90%+ from ATH) - DEAD TOKEN")
     elif ath_drawdown > 0.7:
-        score -= 0.5
         signals.append("⚠️ Heavy drawdown (-70%+ from ATH) - avoid")
+    elif ath_drawdown > 0.5:
+        signals.append("Drawdown (-50%+ from ATH)")
     
     # If price breaking down with accelerating losses
     if change_24h < -30:
@@ -258,16 +299,15 @@ def detect_engine_c(change_24h: float, market_cap: float, age_days: int, volume:
     
     # 114514 PATTERN: Buy/Sell ratio (whale pressure indicator)
     # Ratio > 1.2 = more buyers than sellers = accumulation
+    # Linear in the ratio: 1.0x = neutral, capped at +0.3 (1.75x) and -0.2 (0.5x)
     if sells > 0:
         buy_sell_ratio = buys / sells
+        score += _clip((buy_sell_ratio - 1.0) * 0.4, -0.2, 0.3)
         if buy_sell_ratio > 1.5:
-            score += 0.3
             signals.append(f"Strong buy pressure ({buy_sell_ratio:.2f}x) - whale accumulation")
         elif buy_sell_ratio > 1.2:
-            score += 0.2
             signals.append(f"Buy pressure ({buy_sell_ratio:.2f}x)")
         elif buy_sell_ratio < 0.8:
-            score -= 0.2  # Penalty for sell pressure
             signals.append(f"Sell pressure ({buy_sell_ratio:.2f}x) - caution")
     
     # Age check
@@ -313,11 +353,13 @@ def analyze_watchlist() -> List[Dict]:
     
     print(f"📋 Analyzing {len(watchlist)} watchlist tokens...\n")
     
+    # One bulk round-trip per chain instead of one request per token
+    token_data = fetch_tokens_data(watchlist)
+    
     for token in watchlist:
         print(f"🔍 {token['name']} (${token['symbol']})...")
         
-        # Fetch current data
-        data = fetch_token_data(token['address'], token['chain'])
+        data = token_data.get(token['address'], {})
         
         if not data:
             print(f"   ⚠️ Could not fetch data\n")
@@ -378,7 +420,7 @@ def analyze_watchlist() -> List[Dict]:
         print(f"   Age: {age_days} days | Engines: {','.join(engines) if engines else 'None'} | Score: {total_score:.2f}\n")
     
     # Sort by total score
-    results.sort(key=lambda x: x['total_score'], reverse=True)
+    results.sort(key=itemgetter('total_score'), reverse=True)
     return results
 
 def generate_html_report(results: List[Dict]) -> str:
@@ -136,9 +136,13 @@ def send_telegram_alert(token_symbol, direction, price, ema50):
     return True
 
 def main():
+    # One scan instant shared by the banner and every state row
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    
     print("=" * 60)
     print("4h EMA50 Crossing Alert System")
-    print(f"Time: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
+    print(f"Time: {now.strftime('%Y-%m-%d %H:%M UTC')}")
     print("=" * 60)
     
     watchlist = load_watchlist()
@@ -170,7 +174,7 @@ def main():
             'last_price': current_price,
             'ema50_approx': ema50,
             'was_above_ema50': is_above,
-            'last_check': datetime.now(timezone.utc).isoformat()
+            'last_check': now_iso
         }
         
         # Trigger alerts
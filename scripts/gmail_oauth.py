@@ -27,6 +27,13 @@ class OAuthHandler(BaseHTTPRequestHandler):
             self.send_response(400)
             self.end_headers()
             self.wfile.write(b"Authorization failed.")
+    
+    def address_string(self):
+        # Skip the reverse-DNS lookup on the loopback peer
+        return self.client_address[0]
+    
+    def log_message(self, format, *args):
+        pass
 
 def get_refresh_token():
     # Load credentials
@@ -55,6 +62,7 @@ def get_refresh_token():
     # Start local server to receive callback
     server = HTTPServer(('localhost', REDIRECT_PORT), OAuthHandler)
     server.auth_code = None
+    server.timeout = 60
     server.handle_request()
     
     if not server.auth_code:
@@ -12,6 +12,16 @@ import json
 import os
 import sys
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
 
 # Configuration
 TOKEN_ADDRESS = "G8fSP7xigLVxA5qyFiTQg7cs6jPsqYDWwqzJVJ6ppump"
@@ -19,13 +29,19 @@ CHAIN = "solana"
 THRESHOLD_LOW = 0.000069
 THRESHOLD_HIGH = 0.000420
 STATE_FILE = os.path.expanduser("~/.openclaw/workspace/config/maman_monitor_state.json")
+os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+
+# Shared session so repeated polls reuse the TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept': 'application/json'})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
 
 def fetch_price():
     """Fetch current price from DexScreener."""
     try:
         url = f"https://api.dexscreener.com/tokens/v1/{CHAIN}/{TOKEN_ADDRESS}"
-        resp = requests.get(url, timeout=30)
-        data = resp.json()
+        resp = _SESSION.get(url, timeout=30)
+        data = _loads(resp.content)
         if data and len(data) > 0:
             return float(data[0].get("priceUsd", 0))
     except Exception as e:
@@ -35,18 +51,15 @@ def fetch_price():
 def load_state():
     """Load previous alert state."""
     try:
-        if os.path.exists(STATE_FILE):
-            with open(STATE_FILE, 'r') as f:
-                return json.load(f)
-    except:
-        pass
-    return {"last_alert": None, "last_price": None}
+        with open(STATE_FILE, 'rb') as f:
+            return _loads(f.read())
+    except (OSError, ValueError):
+        return {"last_alert": None, "last_price": None}
 
 def save_state(state):
     """Save current alert state."""
-    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    with open(STATE_FILE, 'wb') as f:
+        f.write(_dumps(state))
 
 def send_alert(message):
     """Send alert via Telegram."""
@@ -59,6 +72,7 @@ def send_alert(message):
 
 def main():
     state = load_state()
+    orig_state = dict(state)
     current_price = fetch_price()
     
     if current_price is None:
@@ -92,8 +106,10 @@ def main():
             print(f"✅ Price normalized: ${current_price} (between thresholds)")
             state["last_alert"] = None
     
-    state["last_price"] = current_price
-    save_state(state)
+    # Quantize to the displayed precision so float jitter doesn't force a write
+    state["last_price"] = round(current_price, 8)
+    if state != orig_state:
+        save_state(state)
     
     if alert_triggered and alert_message:
         send_alert(alert_message)
@@ -1,16 +1,34 @@
 #!/usr/bin/env python3
 """
-2-Hour EMA50 Monitor for $ME
+2-Hour EMA50 Monitor for $ME (and any other token listed in MONITORS)
 Tracks price and alerts when it loses 2h EMA50 support
 """
 
 import os
+import sys
 import json
-import requests
 import time
+import threading
+import urllib3
+from array import array
+from urllib3.util.retry import Retry
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, fields
+
+from ohlc_cache import OHLCCache
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
 
 # Token config
 TOKEN_ADDRESS = "3wshHmD3aBx3wfHPeGWq2o38BNpVaEf7iFf3gYgRpump"
@@ -18,187 +36,447 @@ CHAIN = "solana"
 SYMBOL = "ME"
 NAME = "In a world full of"
 
+# Sent with every request; JSON compresses well
+HTTP_HEADERS = {"accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+
 # Birdeye API
 BIRDEYE_API_KEY = os.getenv("BIRDEYE_API_KEY", "bb463164ead7429686f982258664fdb9")
+BIRDEYE_OHLCV_URL = "https://public-api.birdeye.so/defi/ohlcv"
+BIRDEYE_HEADERS = {**HTTP_HEADERS, "X-API-KEY": BIRDEYE_API_KEY}
+
+# DexScreener spot price
+DEXSCREENER_TOKEN_URL = "https://api.dexscreener.com/tokens/v1/{chain}/{address}"
+# Single-pair lookup: one small object instead of every pool the token trades in
+DEXSCREENER_PAIR_URL = "https://api.dexscreener.com/latest/dex/pairs/{chain}/{pair}"
+
+# One Birdeye and one DexScreener request per token run concurrently
+MAX_WORKERS = 8
+
+# Shared urllib3 pool: both APIs reuse keep-alive connections, and the
+# cron job skips the import cost of requests
+HTTP = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=MAX_WORKERS,
+    retries=Retry(
+        total=2, connect=2, read=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    ),
+    timeout=urllib3.Timeout(connect=3, read=5),
+)
 
 # State file for tracking
 STATE_FILE = "/Users/pterion2910/.openclaw/workspace/config/me_ema50_state.json"
 ALERT_COOLDOWN_HOURS = 6  # Don't alert more than once per 6 hours
+HISTORY_LEN = 100  # Checks kept in MonitorState.history
+HISTORY_MASK = (1 << HISTORY_LEN) - 1
 
 # MANUAL EMA OVERRIDE
 # Set this to the EMA50 value you see on DexScreener chart
 # If None, will calculate from API data
 MANUAL_EMA50 = 0.00020  # Based on user's chart: ~$0.00020
 
+EMA_PERIOD = 50
+CANDLE_SECONDS = 2 * 3600
+
+# Adaptive cadence: (max |distance %| from EMA, seconds until next check)
+POLL_INTERVALS = ((2.0, 30 * 60), (10.0, 2 * 3600))
+POLL_INTERVAL_FAR = 6 * 3600
+# Early in a bucket the in-progress candle's close stands in for the spot price
+PRICE_FRESH_SECONDS = 300
+DAEMON_MIN_SLEEP = 60  # --daemon retry floor when a check could not reschedule itself
+
+# Closed 2h candles as [open_ts, close] for every monitored token, kept next to the state file
+OHLC_CACHE = OHLCCache(os.path.join(os.path.dirname(STATE_FILE), "me_2h_closes.json"), CANDLE_SECONDS)
+OHLC_CACHE_LOCK = threading.Lock()  # fetch workers update the cache concurrently
+
 @dataclass
+class TokenCfg:
+    symbol: str
+    address: str
+    state_file: str
+    manual_ema50: Optional[float] = None
+    chain: str = CHAIN
+    pair_address: Optional[str] = None  # price from this pool instead of the token lookup
+
+# Tokens to check each run; give each its own state file
+MONITORS: List[TokenCfg] = [
+    TokenCfg(SYMBOL, TOKEN_ADDRESS, STATE_FILE, MANUAL_EMA50),
+]
+
+@dataclass(slots=True, frozen=True)
 class PriceData:
+    # Only the close feeds the EMA; o/h/l/v are not kept
     timestamp: int
-    open: float
-    high: float
-    low: float
     close: float
-    volume: float
 
-def fetch_ohlc_2h(limit: int = 60) -> List[PriceData]:
+@dataclass(slots=True)
+class MonitorState:
+    """Per-token state persisted between runs."""
+    last_alert_time: float = 0
+    last_price: float = 0  # 0 until the first completed check
+    last_ema: float = 0
+    ema50: Optional[float] = None
+    last_candle_ts: int = 0
+    next_check_unix: int = 0
+    price_etag: str = ""
+    history: Dict = field(default_factory=lambda: load_history(None))
+
+def fetch_ohlc_2h(cfg: TokenCfg, limit: int = 60) -> List[PriceData]:
     """
     Fetch 2-hour OHLC data from multiple sources.
     Try DexScreener-compatible sources first for accuracy.
     """
     candles = []
+    now = time.time()
+    now_ts = int(now)
+    
+    # Nothing new can be returned until the next bucket after the cache closes
+    if not OHLC_CACHE.should_fetch(cfg.address, "2H", now):
+        print(f"   ⏭️ ${cfg.symbol}: no new closed candle since last fetch, using cache")
+        return candles
+    
+    # Only ask for buckets newer than what is already cached
+    time_from = max(now_ts - limit * CANDLE_SECONDS,
+                    OHLC_CACHE.last_closed_ts(cfg.address, "2H") + 1)
     
     # Try Birdeye first
     try:
-        headers = {"accept": "application/json", "X-API-KEY": BIRDEYE_API_KEY}
-        resp = requests.get(
-            "https://public-api.birdeye.so/defi/ohlcv",
-            params={
-                "address": TOKEN_ADDRESS,
+        resp = HTTP.request(
+            "GET",
+            BIRDEYE_OHLCV_URL,
+            fields={
+                "address": cfg.address,
                 "type": "2H",
-                "time_from": int(time.time()) - (limit * 2 * 3600),
-                "time_to": int(time.time())
+                "time_from": time_from,
+                "time_to": now_ts
             },
-            headers=headers,
-            timeout=30
+            headers=BIRDEYE_HEADERS
         )
         
-        data = resp.json()
+        data = _loads(resp.data)
         if data.get("success"):
             items = data.get("data", {}).get("items", [])
             for item in items:
                 candles.append(PriceData(
                     timestamp=item.get("unixTime", 0),
-                    open=float(item.get("o", 0)),
-                    high=float(item.get("h", 0)),
-                    low=float(item.get("l", 0)),
-                    close=float(item.get("c", 0)),
-                    volume=float(item.get("v", 0))
+                    close=float(item.get("c", 0))
                 ))
+            if not items:
+                with OHLC_CACHE_LOCK:
+                    OHLC_CACHE.mark_empty(cfg.address, "2H", now)
     except Exception as e:
-        print(f"   Birdeye error: {e}")
+        print(f"   ${cfg.symbol} Birdeye error: {e}")
     
-    # If insufficient data, try to estimate from pair data
-    if len(candles) < 50:
-        print(f"   ⚠️ Only {len(candles)} candles from Birdeye, attempting fallback...")
+    # Saved once by monitor() after every fetch has finished
+    with OHLC_CACHE_LOCK:
+        OHLC_CACHE.merge(cfg.address, "2H", [
+            [c.timestamp, c.close] for c in candles
+        ], now)
+    
+    # If insufficient data for a full EMA seed, try to estimate from pair data
+    if limit >= EMA_PERIOD and len(candles) < EMA_PERIOD:
+        print(f"   ⚠️ ${cfg.symbol}: only {len(candles)} candles from Birdeye, attempting fallback...")
         # Could add more sources here (CoinGecko, direct RPC, etc.)
     
     return candles
 
-def calculate_ema(prices: List[float], period: int) -> List[float]:
+def calculate_ema(prices: Sequence[float], period: int) -> List[float]:
     """Calculate EMA for a list of prices."""
     if len(prices) < period:
         return []
     
     multiplier = 2 / (period + 1)
-    ema = [sum(prices[:period]) / period]  # Start with SMA
+    sma = sum(prices[:period]) / period  # Start with SMA
+    
+    # One accumulate() call replaces the append loop; each step still runs the lambda
+    return list(accumulate(
+        prices[period:],
+        lambda ema, price: (price - ema) * multiplier + ema,
+        initial=sma,
+    ))
+
+def update_ema(state: MonitorState, candles: List[PriceData], now: float) -> Optional[float]:
+    """
+    Fold closed candles newer than state.last_candle_ts into state.ema50.
+    Seeds the EMA from a full window when there is no stored value yet;
+    returns None if there is not enough history to do so.
+    """
+    closed = [c for c in candles if c.timestamp + CANDLE_SECONDS <= now]
+    ema = state.ema50
+    last_ts = state.last_candle_ts
     
-    for price in prices[period:]:
-        ema.append((price - ema[-1]) * multiplier + ema[-1])
+    if ema is None:
+        ema_values = calculate_ema(array('d', [c.close for c in closed]), EMA_PERIOD)
+        if not ema_values:
+            return None
+        ema = ema_values[-1]
+    else:
+        multiplier = 2 / (EMA_PERIOD + 1)
+        for c in closed:
+            if c.timestamp > last_ts:
+                ema = (c.close - ema) * multiplier + ema
     
+    if closed:
+        state.last_candle_ts = max(last_ts, closed[-1].timestamp)
+    state.ema50 = ema
     return ema
-def get_current_price() -> Optional[float]:
-    """Get current price from DexScreener."""
+
+def get_current_price(cfg: TokenCfg, state: MonitorState) -> Optional[float]:
+    """
+    Get current price from DexScreener, from cfg.pair_address when set.
+    Sends the ETag from the last response; a 304 means the price has not
+    changed, so state.last_price is returned without reading a body.
+    """
+    headers = dict(HTTP_HEADERS)
+    if state.price_etag and state.last_price:
+        headers["If-None-Match"] = state.price_etag
+    if cfg.pair_address:
+        url = DEXSCREENER_PAIR_URL.format(chain=cfg.chain, pair=cfg.pair_address)
+    else:
+        url = DEXSCREENER_TOKEN_URL.format(chain=cfg.chain, address=cfg.address)
     try:
-        resp = requests.get(
-            f"https://api.dexscreener.com/tokens/v1/{CHAIN}/{TOKEN_ADDRESS}",
-            timeout=30
-        )
-        data = resp.json()
+        resp = HTTP.request("GET", url, headers=headers)
+        if resp.status == 304:
+            return state.last_price
+        data = _loads(resp.data)
+        if cfg.pair_address:
+            data = data.get("pairs") or []
         if data and len(data) > 0:
+            state.price_etag = resp.headers.get("ETag", "")
             return float(data[0].get("priceUsd", 0))
     except Exception as e:
-        print(f"[Error] Getting current price: {e}")
+        print(f"[Error] Getting current price for ${cfg.symbol}: {e}")
     return None
 
-def load_state() -> Dict:
+def load_history(raw) -> Dict:
+    """
+    Columnar history: time/price/ema deques plus above_mask, where bit 0
+    is the newest check (1 = above EMA). Converts the older list-of-dicts
+    layout and trims everything to HISTORY_LEN. The mask is stored as a hex
+    string since it is wider than the 64-bit integers orjson accepts.
+    """
+    if isinstance(raw, list):
+        raw = raw[-HISTORY_LEN:]
+        mask = 0
+        for entry in raw:
+            mask = (mask << 1) | int(entry["above"])
+        raw = {
+            "time": [e["time"] for e in raw],
+            "price": [e["price"] for e in raw],
+            "ema": [e["ema"] for e in raw],
+            "above_mask": mask,
+        }
+    elif not raw:
+        raw = {"time": [], "price": [], "ema": [], "above_mask": 0}
+    mask = raw["above_mask"]
+    if isinstance(mask, str):
+        mask = int(mask, 16)
+    return {
+        "time": deque(raw["time"], maxlen=HISTORY_LEN),
+        "price": deque(raw["price"], maxlen=HISTORY_LEN),
+        "ema": deque(raw["ema"], maxlen=HISTORY_LEN),
+        "above_mask": mask & HISTORY_MASK,
+    }
+
+def analyze_history(state: MonitorState, recent: int = 6) -> Dict:
+    """
+    Regime stats straight from the history bitmask, no per-entry loop.
+    Cross indices point into the history columns at the first check on the
+    new side; streaks count the newest checks that share the latest side.
+    """
+    history = state.history
+    n = len(history["time"])
+    mask = history["above_mask"] & ((1 << n) - 1)
+    pairs = (1 << max(n - 1, 0)) - 1  # bit i compares check age i with age i+1
+    down = (mask >> 1) & ~mask & pairs
+    up = mask & ~(mask >> 1) & pairs
+    below = ~mask & ((1 << n) - 1)
+    return {
+        "crosses_down": [n - 1 - i for i in range(n) if down >> i & 1][::-1],
+        "crosses_up": [n - 1 - i for i in range(n) if up >> i & 1][::-1],
+        "above_recent": (mask & ((1 << recent) - 1)).bit_count(),
+        # x ^ (x + 1) sets the trailing run of ones plus one bit
+        "above_streak": (mask ^ (mask + 1)).bit_length() - 1,
+        "below_streak": (below ^ (below + 1)).bit_length() - 1,
+    }
+
+_STATE_FIELDS = tuple(f.name for f in fields(MonitorState))
+
+def load_state(cfg: TokenCfg) -> MonitorState:
     """Load alert state from file."""
     try:
-        with open(STATE_FILE, 'r') as f:
-            return json.load(f)
-    except:
-        return {
-            "last_alert_time": 0,
-            "last_price": 0,
-            "last_ema": 0,
-            "above_ema_count": 0,
-            "below_ema_count": 0,
-            "history": []
-        }
+        with open(cfg.state_file, 'rb') as f:
+            raw = _loads(f.read())
+    except (OSError, ValueError):
+        return MonitorState()
+    # Keys from older layouts (e.g. the above/below counters) are dropped
+    state = MonitorState(**{k: v for k, v in raw.items() if k in _STATE_FIELDS})
+    state.history = load_history(raw.get("history"))
+    return state
 
-def save_state(state: Dict):
-    """Save alert state to file."""
-    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+def save_state(cfg: TokenCfg, state: MonitorState):
+    """Save alert state to file (write-then-rename, so readers never see a partial file)."""
+    os.makedirs(os.path.dirname(cfg.state_file), exist_ok=True)
+    tmp = cfg.state_file + ".tmp"
+    with open(tmp, 'wb') as f:
+        history = {k: list(v) if isinstance(v, deque) else v for k, v in state.history.items()}
+        history["above_mask"] = format(history["above_mask"], "x")
+        data = {name: getattr(state, name) for name in _STATE_FIELDS}
+        f.write(_dumps({**data, "history": history}))
+    os.replace(tmp, cfg.state_file)
 
-def can_alert(state: Dict) -> bool:
+def can_alert(state: MonitorState) -> bool:
     """Check if enough time has passed since last alert."""
-    last_alert = state.get("last_alert_time", 0)
-    hours_since = (time.time() - last_alert) / 3600
+    hours_since = (time.time() - state.last_alert_time) / 3600
     return hours_since >= ALERT_COOLDOWN_HOURS
 
-def send_alert(price: float, ema50: float, state: Dict) -> str:
-    """Generate alert message."""
-    pct_diff = ((price - ema50) / ema50) * 100
-    
-    msg = f"""🚨 **$ME EMA50 ALERT** 🚨
+def next_check_delay(pct_diff: float) -> int:
+    """Seconds to wait before the next check; closer to the EMA means sooner."""
+    distance = abs(pct_diff)
+    for max_distance, delay in POLL_INTERVALS:
+        if distance < max_distance:
+            return delay
+    return POLL_INTERVAL_FAR
+
+_ALERT_TMPL = """🚨 **${symbol} EMA50 ALERT** 🚨
 
 **Price has LOST 2h EMA50 support!**
 
 📊 **Current Status:**
-   • Price: ${price:.8f}
-   • 2h EMA50: ${ema50:.8f}
-   • Distance: {pct_diff:+.2f}%
+   • Price: ${price}
+   • 2h EMA50: ${ema}
+   • Distance: {diff}%
 
 📉 **What this means:**
    Bearish signal - price trading below key support
    Consider: Reduce position, set stop loss, or wait for reclaim
 
 🔗 **Links:**
-   • DexScreener: https://dexscreener.com/solana/{TOKEN_ADDRESS[:8]}...
-   • Solscan: https://solscan.io/token/{TOKEN_ADDRESS}
+   • DexScreener: https://dexscreener.com/{chain}/{short_address}...
+   • Solscan: https://solscan.io/token/{address}
 
 ⏰ Alert cooldown: 6 hours
 """
-    return msg
 
-def monitor():
-    """Main monitoring function."""
+def send_alert(cfg: TokenCfg, price: float, ema50: float, state: MonitorState) -> str:
+    """Generate alert message."""
+    pct_diff = ((price - ema50) / ema50) * 100
+    
+    return _ALERT_TMPL.format(
+        symbol=cfg.symbol,
+        price=format(price, '.8f'),
+        ema=format(ema50, '.8f'),
+        diff=format(pct_diff, '+.2f'),
+        chain=cfg.chain,
+        short_address=cfg.address[:8],
+        address=cfg.address,
+    )
+
+def fresh_close(candles: List[PriceData], now: float) -> Optional[float]:
+    """Close of the newest candle if it opened less than PRICE_FRESH_SECONDS ago."""
+    if candles and now - candles[-1].timestamp < PRICE_FRESH_SECONDS:
+        return candles[-1].close
+    return None
+
+def candle_limit(state: MonitorState, now: float) -> int:
+    """Candles to request: a full seed window, or just those closed since the last run."""
+    if state.ema50 is None:
+        return 60
+    return max(1, int(now - state.last_candle_ts) // CANDLE_SECONDS + 2)
+
+def monitor(force: bool = False, states: Optional[Dict[str, MonitorState]] = None) -> int:
+    """
+    Main monitoring function. force=True ignores the adaptive schedule.
+    states, keyed by symbol, keeps token state in memory across calls
+    (daemon mode); tokens missing from it are loaded from disk.
+    Returns the earliest next_check_unix over all tokens.
+    """
     print("=" * 70)
-    print(f"🕐 $ME 2-Hour EMA50 Monitor")
+    print(f"🕐 2-Hour EMA50 Monitor ({', '.join('$' + cfg.symbol for cfg in MONITORS)})")
     print("=" * 70)
     print(f"Time: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
     print()
     
-    # Load state
-    state = load_state()
+    now = time.time()
+    
+    if states is None:
+        states = {}
     
-    # Fetch OHLC data
-    print("📊 Fetching 2-hour candle data...")
-    candles = fetch_ohlc_2h(limit=60)
+    # Far from the EMA a cross is unlikely; skip until the scheduled check
+    due = []
+    for cfg in MONITORS:
+        state = states.get(cfg.symbol)
+        if state is None:
+            state = states[cfg.symbol] = load_state(cfg)
+        next_check = state.next_check_unix
+        if not force and now < next_check:
+            print(f"⏭️ ${cfg.symbol}: next check due at {datetime.fromtimestamp(next_check, timezone.utc).strftime('%H:%M UTC')}, skipping")
+            continue
+        due.append((cfg, state))
+    
+    if due:
+        # Every (token, API) request runs concurrently, so wall time is the slowest
+        # single request rather than the sum over tokens
+        print("📊 Fetching 2-hour candle data and current prices...")
+        # Just after a bucket opens Birdeye's in-progress candle already carries
+        # the current price, so DexScreener is only asked if that candle is missing
+        early_in_bucket = now % CANDLE_SECONDS < PRICE_FRESH_SECONDS
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = []
+            for cfg, state in due:
+                # A manual EMA override needs no candles at all
+                candles_future = None
+                if cfg.manual_ema50 is None:
+                    candles_future = pool.submit(fetch_ohlc_2h, cfg, limit=candle_limit(state, now))
+                price_future = None
+                if candles_future is None or not early_in_bucket:
+                    price_future = pool.submit(get_current_price, cfg, state)
+                futures.append((cfg, state, candles_future, price_future))
+            pending = []
+            for cfg, state, candles_future, price_future in futures:
+                candles = candles_future.result() if candles_future else []
+                price = None
+                if price_future is None:
+                    price = fresh_close(candles, now)
+                    if price is None:
+                        price_future = pool.submit(get_current_price, cfg, state)
+                    else:
+                        state.price_etag = ""  # last_price will no longer match DexScreener's tag
+                pending.append((cfg, state, candles, price, price_future))
+            fetched = [
+                (cfg, state, candles, price if price_future is None else price_future.result())
+                for cfg, state, candles, price, price_future in pending
+            ]
+        OHLC_CACHE.save()
+        
+        for cfg, state, candles, current_price in fetched:
+            check_token(cfg, state, candles, current_price, now)
+    
+    return min(states[cfg.symbol].next_check_unix for cfg in MONITORS)
+
+def check_token(cfg: TokenCfg, state: MonitorState, candles: List[PriceData],
+                current_price: Optional[float], now: float):
+    """Update one token's EMA and state from fetched data and alert on a loss of support."""
+    print()
+    print(f"── ${cfg.symbol} " + "─" * 60)
     
     # Determine EMA50 value
-    if MANUAL_EMA50 is not None:
-        current_ema = MANUAL_EMA50
+    if cfg.manual_ema50 is not None:
+        current_ema = cfg.manual_ema50
         print(f"   ⚙️ Using MANUAL EMA50: ${current_ema:.8f}")
-        print(f"   (Set MANUAL_EMA50 = None to auto-calculate from chart data)")
-    elif len(candles) >= 50:
-        print(f"   ✓ Got {len(candles)} candles")
-        # Calculate EMA50
-        closes = [c.close for c in candles]
-        ema_values = calculate_ema(closes, 50)
-        
-        if ema_values:
-            current_ema = ema_values[-1]
-        else:
-            print("   ⚠️ Could not calculate EMA50")
-            return
+        print(f"   (Set manual_ema50 = None to auto-calculate from chart data)")
     else:
-        print(f"   ⚠️ Insufficient data: {len(candles)} candles (need 50+)")
-        return
-    
-    # Get current price
-    print("💰 Fetching current price...")
-    current_price = get_current_price()
+        print(f"   ✓ Got {len(candles)} new candles")
+        # Fold from the cache rather than this run's fetch: candles cached by a
+        # run that never reached save_state would otherwise be skipped for good
+        since = 0 if state.ema50 is None else state.last_candle_ts
+        candles = [PriceData(*row) for row in OHLC_CACHE.get_closed_candles(cfg.address, "2H", since=since)]
+        current_ema = update_ema(state, candles, now)
+        if current_ema is None:
+            print(f"   ⚠️ Insufficient data: {len(candles)} candles (need {EMA_PERIOD}+ closed)")
+            return
     
     if not current_price:
         print("   ⚠️ Could not get current price")
@@ -214,13 +492,14 @@ def monitor():
     print(f"   Distance: {pct_diff:+.2f}% from EMA")
     print(f"   Status: {'✅ Above EMA' if above_ema else '⚠️ Below EMA'}")
     
-    # Update state
-    if above_ema:
-        state["above_ema_count"] = state.get("above_ema_count", 0) + 1
-        state["below_ema_count"] = 0
-    else:
-        state["below_ema_count"] = state.get("below_ema_count", 0) + 1
-        state["above_ema_count"] = 0
+    # Record this check; the deques drop their oldest entry and the mask is
+    # clipped to the same window
+    history = state.history
+    history["time"].append(int(time.time()))
+    history["price"].append(current_price)
+    history["ema"].append(current_ema)
+    history["above_mask"] = ((history["above_mask"] << 1) | above_ema) & HISTORY_MASK
+    regime = analyze_history(state)
     
     # Check for alert condition
     # Alert if:
@@ -232,33 +511,28 @@ def monitor():
     
     if not above_ema and can_alert(state):
         # Check if this is a new cross or sustained below
-        last_was_above = state.get("last_price", current_price) > state.get("last_ema", current_ema)
-        sustained_below = state.get("below_ema_count", 0) >= 2
+        # On the first check last_price/last_ema are still 0, so there is no
+        # previous side to have crossed from
+        last_was_above = state.last_price > state.last_ema
+        sustained_below = regime["below_streak"] >= 2
         
         if last_was_above or sustained_below:
             alert_triggered = True
-            state["last_alert_time"] = time.time()
+            state.last_alert_time = time.time()
             
             # Generate and print alert (for cron to capture)
-            alert_msg = send_alert(current_price, current_ema, state)
+            alert_msg = send_alert(cfg, current_price, current_ema, state)
             print("\n" + "=" * 70)
             print("🔔 ALERT TRIGGERED!")
             print("=" * 70)
             print(alert_msg)
     
     # Update state
-    state["last_price"] = current_price
-    state["last_ema"] = current_ema
-    state["history"].append({
-        "time": int(time.time()),
-        "price": current_price,
-        "ema": current_ema,
-        "above": above_ema
-    })
-    # Keep last 100 entries
-    state["history"] = state["history"][-100:]
+    state.last_price = current_price
+    state.last_ema = current_ema
+    state.next_check_unix = int(now) + next_check_delay(pct_diff)
     
-    save_state(state)
+    save_state(cfg, state)
     
     print("\n" + "=" * 70)
     if not alert_triggered:
@@ -267,5 +541,23 @@ def monitor():
         print("✅ Alert sent!")
     print("=" * 70)
 
+def run_forever():
+    """
+    Resident loop for --daemon: keeps connections and state in memory and
+    sleeps until the next token is due instead of paying startup per cron tick.
+    """
+    states: Dict[str, MonitorState] = {}
+    while True:
+        try:
+            next_due = monitor(states=states)
+        except Exception as e:
+            print(f"[Error] Monitor run failed: {e}")
+            states.clear()  # reload from disk next time
+            next_due = 0
+        time.sleep(max(DAEMON_MIN_SLEEP, next_due - time.time()))
+
 if __name__ == "__main__":
-    monitor()
+    if "--daemon" in sys.argv:
+        run_forever()
+    else:
+        monitor(force="--force" in sys.argv)
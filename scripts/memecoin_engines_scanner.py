@@ -7,16 +7,58 @@ Generates HTML report with contract addresses and engine qualifications
 import os
 import sys
 import json
+import html
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from operator import attrgetter
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 # Add scanner engines path
 sys.path.insert(0, '/Users/pterion2910/.openclaw/workspace/scanner_engines')
 
-@dataclass
+# CoinGecko ids that identify a Solana token
+SOLANA_PREFIXES = ("solana",)
+
+# Print why each token failed the trading rules
+VERBOSE = "--verbose" in sys.argv
+
+# HTTP: the scan is all network wait, so requests run concurrently
+HISTORY_WORKERS = 32  # concurrent price-history requests to DexScreener
+DEX_BATCH_SIZE = 30  # DexScreener /tokens/v1 accepts up to 30 addresses per call
+
+# Shared keep-alive pool, so repeat calls to a host skip the TCP/TLS handshake.
+# Rate-limited (429) and 5xx responses are retried with exponential back-off.
+SESSION = requests.Session()
+SESSION.headers["Accept-Encoding"] = "gzip"
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=2 * HISTORY_WORKERS,  # every history worker always has a socket
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    ),
+))
+
+# Price-history cache shared between scans: "chain:address" -> [fetched_at, prices]
+PRICE_CACHE_FILE = '/Users/pterion2910/.openclaw/workspace/cache/price_history.json'
+PRICE_CACHE_TTL = 600  # seconds
+_PRICE_CACHE: Dict[str, list] = {}
+
+@dataclass(slots=True)
 class Token:
     symbol: str
     name: str
@@ -35,26 +77,36 @@ class Token:
     engine_b_signal: bool = False  
     engine_c_signal: bool = False
     engine_score: float = 0.0
+    
+    # Report links, built once per token
+    dex_url: str = field(init=False, default="")
+    bubble_url: str = field(init=False, default="")
+    chain_display: str = field(init=False, default="")
+    
+    def __post_init__(self):
+        self.dex_url = f"https://dexscreener.com/{self.chain}/{self.address}"
+        self.bubble_url = f"https://app.bubblemaps.io/{self.chain}/token/{self.address}"
+        self.chain_display = self.chain.upper()
 
 # ==================== DATA SOURCES ====================
 
 def fetch_coingecko() -> List[Dict]:
     """Fetch trending coins from CoinGecko."""
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             "https://api.coingecko.com/api/v3/search/trending",
             timeout=15
         )
-        data = resp.json()
+        data = _loads(resp.content)
         coins = []
         for item in data.get('coins', []):
-            coin = item.get('item', {})
+            get = item.get('item', {}).get
             coins.append({
-                'symbol': coin.get('symbol', ''),
-                'name': coin.get('name', ''),
-                'address': coin.get('contract_address', ''),
-                'chain': 'solana' if coin.get('id', '').startswith('solana') else 'ethereum',
-                'market_cap': coin.get('market_cap', 0),
+                'symbol': get('symbol', ''),
+                'name': get('name', ''),
+                'address': get('contract_address', ''),
+                'chain': 'solana' if get('id', '').startswith(SOLANA_PREFIXES) else 'ethereum',
+                'market_cap': get('market_cap', 0),
                 'volume_24h': 0,  # Need separate call
                 'change_24h': 0,
                 'source': 'coingecko'
@@ -67,24 +119,25 @@ def fetch_coingecko() -> List[Dict]:
 def fetch_dexscreener() -> List[Dict]:
     """Fetch boosted tokens from DexScreener."""
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             "https://api.dexscreener.com/token-boosts/top/v1",
             timeout=15
         )
-        data = resp.json()
+        data = _loads(resp.content)
         tokens = []
         for item in data:
-            token_info = item.get('token', {})
+            token_get = item.get('token', {}).get
+            get = item.get
             tokens.append({
-                'symbol': token_info.get('symbol', ''),
-                'name': token_info.get('name', ''),
-                'address': token_info.get('address', ''),
-                'chain': item.get('chainId', 'solana'),
-                'price': float(token_info.get('priceUsd', 0)),
-                'market_cap': float(token_info.get('marketCap', 0)),
-                'volume_24h': float(item.get('volume', {}).get('h24', 0)),
-                'change_24h': float(item.get('priceChange', {}).get('h24', 0)),
-                'liquidity': float(item.get('liquidity', {}).get('usd', 0)),
+                'symbol': token_get('symbol', ''),
+                'name': token_get('name', ''),
+                'address': token_get('address', ''),
+                'chain': get('chainId', 'solana'),
+                'price': float(token_get('priceUsd', 0)),
+                'market_cap': float(token_get('marketCap', 0)),
+                'volume_24h': float(get('volume', {}).get('h24', 0)),
+                'change_24h': float(get('priceChange', {}).get('h24', 0)),
+                'liquidity': float(get('liquidity', {}).get('usd', 0)),
                 'source': 'dexscreener'
             })
         return tokens
@@ -96,25 +149,26 @@ def fetch_birdeye() -> List[Dict]:
     """Fetch trending Solana tokens from Birdeye (public endpoint)."""
     try:
         # Birdeye requires API key, use public trending as fallback
-        resp = requests.get(
+        resp = SESSION.get(
             "https://public-api.birdeye.so/public/trending?timeframe=24h",
             headers={"accept": "application/json"},
             timeout=15
         )
-        data = resp.json()
+        data = _loads(resp.content)
         tokens = []
         for item in data.get('data', {}).get('tokens', []):
+            get = item.get
             tokens.append({
-                'symbol': item.get('symbol', ''),
-                'name': item.get('name', ''),
-                'address': item.get('address', ''),
+                'symbol': get('symbol', ''),
+                'name': get('name', ''),
+                'address': get('address', ''),
                 'chain': 'solana',
-                'price': float(item.get('price', 0)),
-                'market_cap': float(item.get('mc', 0)),
-                'volume_24h': float(item.get('v24h', 0)),
-                'change_24h': float(item.get('v24hChangePercent', 0)),
-                'liquidity': float(item.get('liquidity', 0)),
-                'holders': int(item.get('uniqueWallet24h', 0)),
+                'price': float(get('price', 0)),
+                'market_cap': float(get('mc', 0)),
+                'volume_24h': float(get('v24h', 0)),
+                'change_24h': float(get('v24hChangePercent', 0)),
+                'liquidity': float(get('liquidity', 0)),
+                'holders': int(get('uniqueWallet24h', 0)),
                 'source': 'birdeye'
             })
         return tokens
@@ -126,24 +180,25 @@ def fetch_gmgn() -> List[Dict]:
     """Fetch trending from GMGN (limited public API)."""
     try:
         # GMGN trending endpoint
-        resp = requests.get(
+        resp = SESSION.get(
             "https://api.gmgn.ai/v1/tokens/trending?limit=50&timeframe=24h",
             timeout=15
         )
-        data = resp.json()
+        data = _loads(resp.content)
         tokens = []
         for item in data.get('data', {}).get('tokens', []):
+            get = item.get
             tokens.append({
-                'symbol': item.get('symbol', ''),
-                'name': item.get('name', ''),
-                'address': item.get('address', ''),
-                'chain': item.get('chain', 'solana'),
-                'price': float(item.get('price', 0)),
-                'market_cap': float(item.get('market_cap', 0)),
-                'volume_24h': float(item.get('volume_24h', 0)),
-                'change_24h': float(item.get('price_change_24h', 0)),
-                'liquidity': float(item.get('liquidity', 0)),
-                'holders': int(item.get('holder_count', 0)),
+                'symbol': get('symbol', ''),
+                'name': get('name', ''),
+                'address': get('address', ''),
+                'chain': get('chain', 'solana'),
+                'price': float(get('price', 0)),
+                'market_cap': float(get('market_cap', 0)),
+                'volume_24h': float(get('volume_24h', 0)),
+                'change_24h': float(get('price_change_24h', 0)),
+                'liquidity': float(get('liquidity', 0)),
+                'holders': int(get('holder_count', 0)),
                 'source': 'gmgn'
             })
         return tokens
@@ -153,15 +208,54 @@ def fetch_gmgn() -> List[Dict]:
 
 # ==================== ENGINE PATTERN DETECTION ====================
 
+def load_price_cache():
+    """Load unexpired price histories from PRICE_CACHE_FILE into memory."""
+    try:
+        with open(PRICE_CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return
+    cutoff = time.time() - PRICE_CACHE_TTL
+    _PRICE_CACHE.update((k, v) for k, v in cached.items() if v[0] >= cutoff)
+
+def save_price_cache():
+    """Write unexpired price histories back (write-then-rename)."""
+    cutoff = time.time() - PRICE_CACHE_TTL
+    fresh = {k: v for k, v in _PRICE_CACHE.items() if v[0] >= cutoff}
+    os.makedirs(os.path.dirname(PRICE_CACHE_FILE), exist_ok=True)
+    tmp = PRICE_CACHE_FILE + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(fresh, f, separators=(',', ':'))
+    os.replace(tmp, PRICE_CACHE_FILE)
+
+def synthetic_prices(price: float) -> List[float]:
+    """3-point history scaled from a spot price; all the engines look at for now."""
+    return [price * 0.9, price * 0.95, price]
+
+def _cached_prices(chain: str, address: str) -> Optional[List[float]]:
+    """Price history from the cache if fetched within PRICE_CACHE_TTL."""
+    cached = _PRICE_CACHE.get(f"{chain}:{address}")
+    if cached and cached[0] >= time.time() - PRICE_CACHE_TTL:
+        return cached[1]
+    return None
+
 def get_historical_prices(address: str, chain: str = 'solana') -> List[float]:
-    """Get historical price data for pattern detection."""
+    """
+    Get historical price data for pattern detection.
+    Served from the price cache when fetched within PRICE_CACHE_TTL.
+    """
+    key = f"{chain}:{address}"
+    cached = _cached_prices(chain, address)
+    if cached is not None:
+        return cached
+    
     try:
         # Use DexScreener for price history
-        resp = requests.get(
+        resp = SESSION.get(
             f"https://api.dexscreener.com/tokens/v1/{chain}/{address}",
             timeout=15
         )
-        data = resp.json()
+        data = _loads(resp.content)
         
         # Extract price history if available
         prices = []
@@ -170,11 +264,98 @@ def get_historical_prices(address: str, chain: str = 'solana') -> List[float]:
             # Get OHLC data for pattern detection
             # This is simplified - real implementation would fetch candle data
             current_price = float(pair.get('priceUsd', 0))
-            prices = [current_price * 0.9, current_price * 0.95, current_price]
+            prices = synthetic_prices(current_price)
+            _PRICE_CACHE[key] = [time.time(), prices]
         return prices
     except Exception as e:
         return []
 
+def get_historical_prices_batch(chain: str, addresses: List[str]) -> Dict[str, List[float]]:
+    """
+    Price histories for up to DEX_BATCH_SIZE addresses on one chain from a
+    single DexScreener call, reusing cached entries. Returns {address: prices}
+    for the addresses DexScreener knows. Falls back to one request per token
+    if the bulk response is not a JSON list (malformed, 404 or another 4xx);
+    when DexScreener is rate-limiting, erroring or unreachable just the cached
+    entries are returned.
+    """
+    results = {}
+    to_fetch = []
+    for address in addresses:
+        cached = _cached_prices(chain, address)
+        if cached is None:
+            to_fetch.append(address)
+        else:
+            results[address] = cached
+    if not to_fetch:
+        return results
+    
+    try:
+        resp = SESSION.get(
+            f"https://api.dexscreener.com/tokens/v1/{chain}/{','.join(to_fetch)}",
+            timeout=15
+        )
+    except Exception:
+        return results
+    # Still failing after the session's retries; more requests would only
+    # add to the load on the host
+    if resp.status_code == 429 or resp.status_code >= 500:
+        return results
+    try:
+        pairs = _loads(resp.content) if resp.status_code != 404 else None
+    except ValueError:
+        pairs = None
+    
+    if not isinstance(pairs, list):
+        for address in to_fetch:
+            results[address] = get_historical_prices(address, chain)
+        return results
+    
+    # First pair per token, matching the single-token lookup; EVM addresses
+    # may come back in a different case
+    wanted = {address.lower(): address for address in to_fetch}
+    now = time.time()
+    for pair in pairs:
+        try:
+            address = wanted.get(pair.get('baseToken', {}).get('address', '').lower())
+        except (TypeError, ValueError, AttributeError):
+            continue
+        if address and address not in results:
+            # A bad price drops just this token, as the single-token lookup does
+            try:
+                prices = synthetic_prices(float(pair.get('priceUsd', 0)))
+            except (TypeError, ValueError, AttributeError):
+                results[address] = []
+                continue
+            results[address] = prices
+            _PRICE_CACHE[f"{chain}:{address}"] = [now, prices]
+    return results
+
+# Scoring kernels: plain scalar arithmetic with each rule's weight multiplied by
+# its boolean, so there are no data-dependent branches. The detect_engine_*
+# wrappers only check the price history length and pick out the points used.
+
+def _engine_a_score(last: float, third_last: float, change_24h: float) -> float:
+    # Uptrend / >10% move / positive day
+    return (0.3 * (last > third_last)
+            + 0.2 * (abs(change_24h) > 10)
+            + 0.2 * (change_24h > 0))
+
+def _engine_b_score(last: float, prev: float, change_24h: float, volume: float) -> float:
+    # Pump / moderate pump (pulled back) / $100K+ volume / recent uptick
+    return (0.3 * (change_24h > 50)
+            + 0.3 * (20 < change_24h < 200)
+            + 0.2 * (volume > 100000)
+            + 0.2 * (last > prev))
+
+def _engine_c_score(last: float, prev: float, change_24h: float, market_cap: float) -> float:
+    # MC threshold / 20%+ pump / positive but not parabolic / within 5% of recent high
+    return (0.3 * (market_cap >= 300000)
+            + 0.1 * (100000 <= market_cap < 300000)
+            + 0.3 * (change_24h > 20)
+            + 0.2 * (0 < change_24h < 300)
+            + 0.2 * (last >= prev * 0.95))
+
 def detect_engine_a(prices: List[float], change_24h: float) -> Tuple[bool, float]:
     """
     Engine A: 12h EMA50 reclaim pattern
@@ -187,20 +368,8 @@ def detect_engine_a(prices: List[float], change_24h: float) -> Tuple[bool, float
     
     # Simplified EMA50 reclaim detection
     # In real implementation, fetch 12h candles and calculate EMA
-    recent_trend = prices[-1] > prices[-3]  # Uptrend
-    significant_move = abs(change_24h) > 10  # >10% move
-    
-    # Score based on trend strength
-    score = 0.0
-    if recent_trend:
-        score += 0.3
-    if significant_move:
-        score += 0.2
-    if change_24h > 0:
-        score += 0.2
-    
-    qualifies = score >= 0.5
-    return qualifies, score
+    score = _engine_a_score(prices[-1], prices[-3], change_24h)
+    return score >= 0.5, score
 
 def detect_engine_b(prices: List[float], change_24h: float, volume: float) -> Tuple[bool, float]:
     """
@@ -213,29 +382,8 @@ def detect_engine_b(prices: List[float], change_24h: float, volume: float) -> Tu
     if len(prices) < 3:
         return False, 0.0
     
-    # Detect pump-dump-reclaim pattern
-    price_change = ((prices[-1] - prices[0]) / prices[0]) * 100 if prices[0] > 0 else 0
-    
-    score = 0.0
-    
-    # Had a pump (significant gain)
-    if change_24h > 50:
-        score += 0.3
-    
-    # Pullback from high (dump)
-    if change_24h < 200 and change_24h > 20:  # Moderate pump, not extreme
-        score += 0.3
-    
-    # Volume confirmation
-    if volume > 100000:  # $100K+ volume
-        score += 0.2
-    
-    # Price stabilizing (reclaiming)
-    if prices[-1] > prices[-2]:  # Recent uptick
-        score += 0.2
-    
-    qualifies = score >= 0.6
-    return qualifies, score
+    score = _engine_b_score(prices[-1], prices[-2], change_24h, volume)
+    return score >= 0.6, score
 
 def detect_engine_c(prices: List[float], change_24h: float, market_cap: float) -> Tuple[bool, float]:
     """
@@ -245,34 +393,62 @@ def detect_engine_c(prices: List[float], change_24h: float, market_cap: float) -
     - MC threshold ≥ $300K
     - Fast, aggressive
     """
-    if len(prices) < 2:
+    # Below $100K neither MC tier applies; such tokens are outside the scanner's
+    # target range (trading rules start at $100K), so skip scoring entirely
+    if len(prices) < 2 or market_cap < 100000:
         return False, 0.0
     
-    score = 0.0
-    
-    # MC threshold
-    if market_cap >= 300000:  # $300K+
-        score += 0.3
-    elif market_cap >= 100000:  # At least $100K
-        score += 0.1
-    
-    # Recent pump activity
-    if change_24h > 20:  # 20%+ gain
-        score += 0.3
-    
-    # Holding gains (not dumping)
-    if change_24h > 0 and change_24h < 300:  # Positive but not parabolic
-        score += 0.2
-    
-    # Price stability (last price >= previous)
-    if prices[-1] >= prices[-2] * 0.95:  # Within 5% of recent high
-        score += 0.2
+    score = _engine_c_score(prices[-1], prices[-2], change_24h, market_cap)
+    return score >= 0.6, score
+
+def score_all(tokens: List[Token], price_lists: List[List[float]]) -> List[int]:
+    """
+    Run all three engines column-wise over every token, then store each
+    token's signals and combined score on it.
+    Returns the [a, b, c] signal counts, accumulated in the same pass.
+    """
+    counts = [0, 0, 0]
+    changes = [t.change_24h for t in tokens]
+    # Engine A: 12h EMA50 Reclaim
+    results_a = map(detect_engine_a, price_lists, changes)
+    # Engine B: 4h Pump→Dump→Reclaim
+    results_b = map(detect_engine_b, price_lists, changes, [t.volume_24h for t in tokens])
+    # Engine C: 1h EMA50 Hold (MC ≥ $300K)
+    results_c = map(detect_engine_c, price_lists, changes, [t.market_cap for t in tokens])
     
-    qualifies = score >= 0.6
-    return qualifies, score
+    for token, (a, score_a), (b, score_b), (c, score_c) in zip(tokens, results_a, results_b, results_c):
+        token.engine_a_signal = a
+        token.engine_b_signal = b
+        token.engine_c_signal = c
+        token.engine_score = score_a + score_b + score_c
+        counts[0] += a
+        counts[1] += b
+        counts[2] += c
+    return counts
 
 # ==================== MEMECOIN TRADING RULES FILTER ====================
 
+def dedupe_tokens(tokens: List[Dict]) -> List[Dict]:
+    """
+    Merge records for the same (chain, address) reported by several sources.
+    Later sources fill in or override fields only where they have a non-zero
+    value. Records without an address are kept as-is.
+    """
+    merged: Dict[Tuple[str, str], Dict] = {}
+    unkeyed = []
+    for token in tokens:
+        address = token.get('address', '')
+        if not address:
+            unkeyed.append(token)
+            continue
+        key = (token.get('chain', 'solana'), address.lower())
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = dict(token)
+        else:
+            existing.update((k, v) for k, v in token.items() if v)
+    return list(merged.values()) + unkeyed
+
 def apply_trading_rules(token: Dict) -> Tuple[bool, str]:
     """
     Apply memecoin trading rules filter.
@@ -299,12 +475,111 @@ def apply_trading_rules(token: Dict) -> Tuple[bool, str]:
     
     return True, "Sweet spot match"
 
+def passes_trading_rules(mc: float, volume: float, liquidity: float) -> bool:
+    """apply_trading_rules as a single boolean test, without building a reason."""
+    return 100000 <= mc <= 500000 and volume >= 50000 and not 0 < liquidity < 50000
+
+def filter_trading_rules(tokens: List[Dict]) -> List[Dict]:
+    """Tokens passing the trading rules, tested column-wise over the whole list."""
+    keep = map(
+        passes_trading_rules,
+        [t.get('market_cap', 0) for t in tokens],
+        [t.get('volume_24h', 0) for t in tokens],
+        [t.get('liquidity', 0) for t in tokens],
+    )
+    passed = []
+    for token, ok in zip(tokens, keep):
+        if ok:
+            passed.append(token)
+        elif VERBOSE:
+            print(f"   ✗ {token.get('symbol', '')}: {apply_trading_rules(token)[1]}")
+    return passed
+
 # ==================== HTML REPORT GENERATION ====================
 
-def generate_html_report(tokens: List[Token], timestamp: str) -> str:
-    """Generate HTML report with engine qualifications."""
+_CHANGE_CLASSES = ("change-negative", "change-positive")
+_CHANGE_SIGNS = ("", "+")
+
+# Engine tag markup for every (A, B, C) signal combination
+_TAG_HTML = (
+    '<span class="engine-tag tag-a">Engine A</span>',
+    '<span class="engine-tag tag-b">Engine B</span>',
+    '<span class="engine-tag tag-c">Engine C</span>',
+)
+_ENGINE_TAGS = {
+    (a, b, c): "".join(tag for tag, on in zip(_TAG_HTML, (a, b, c)) if on)
+               or '<span style="color: #888;">No engine signals</span>'
+    for a in (False, True) for b in (False, True) for c in (False, True)
+}
+
+# One report card; filled with str.format_map, so the template is parsed once
+_TOKEN_CARD = """
+            <div class="token-card">
+                <div class="token-header">
+                    <div>
+                        <div class="token-name">{name}</div>
+                        <div class="token-symbol">${symbol} • {chain_display}</div>
+                    </div>
+                    <div class="change-badge {change_class}">{change_sign}{change_24h:.1f}%</div>
+                </div>
+                
+                <div class="token-stats">
+                    <div class="token-stat">
+                        <div class="token-stat-value">${price:.8f}</div>
+                        <div class="token-stat-label">Price</div>
+                    </div>
+                    <div class="token-stat">
+                        <div class="token-stat-value">${market_cap_k:.0f}K</div>
+                        <div class="token-stat-label">Market Cap</div>
+                    </div>
+                    <div class="token-stat">
+                        <div class="token-stat-value">${volume_k:.0f}K</div>
+                        <div class="token-stat-label">24h Volume</div>
+                    </div>
+                </div>
+                
+                <div class="engine-tags">
+                    {engine_tags}
+                </div>
+                
+                <div class="contract-box">
+                    <div class="contract-label">Contract Address</div>
+                    <div class="contract-address">{address}</div>
+                </div>
+                
+                <div class="links">
+                    <a href="{dex_url}" target="_blank" class="link-btn">DexScreener</a>
+                    <a href="{bubble_url}" target="_blank" class="link-btn">Bubble Maps</a>
+                </div>
+            </div>
+"""
+
+_HTML_FOOTER = """
+        </div>
+        
+        <div class="footer">
+            <p>Generated by PolyClaw Memecoin Scanner v4</p>
+            <p style="margin-top: 10px; font-size: 0.8em;">
+                Sources: CoinGecko, DexScreener, Birdeye, GMGN | 
+                Engines: EMA50 Reclaim, Pump-Dump-Reclaim, EMA50 Hold
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+def generate_html_report(tokens: List[Token], counts: List[int], timestamp: str, fh):
+    """
+    Write the HTML report with engine qualifications to the text file fh.
+    counts holds the [a, b, c] signal totals from score_all().
+    Each part is written as soon as it is built, so the whole document
+    is never held in memory. Token fields come straight from the APIs and
+    are HTML-escaped before they go into a card.
+    """
+    escape = html.escape
     
-    html = f"""<!DOCTYPE html>
+    fh.write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -571,15 +846,15 @@ def generate_html_report(tokens: List[Token], timestamp: str) -> str:
                 <div class="stat-label">Sweet Spot Matches</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value">{sum(1 for t in tokens if t.engine_a_signal)}</div>
+                <div class="stat-value">{counts[0]}</div>
                 <div class="stat-label">Engine A Signals</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value">{sum(1 for t in tokens if t.engine_b_signal)}</div>
+                <div class="stat-value">{counts[1]}</div>
                 <div class="stat-label">Engine B Signals</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value">{sum(1 for t in tokens if t.engine_c_signal)}</div>
+                <div class="stat-value">{counts[2]}</div>
                 <div class="stat-label">Engine C Signals</div>
             </div>
         </div>
@@ -596,86 +871,28 @@ def generate_html_report(tokens: List[Token], timestamp: str) -> str:
         </div>
         
         <div class="token-grid">
-"""
+""")
     
     # Add token cards
     for token in tokens:
-        change_class = "change-positive" if token.change_24h >= 0 else "change-negative"
-        change_sign = "+" if token.change_24h >= 0 else ""
-        
-        # Build engine tags
-        engine_tags = ""
-        if token.engine_a_signal:
-            engine_tags += '<span class="engine-tag tag-a">Engine A</span>'
-        if token.engine_b_signal:
-            engine_tags += '<span class="engine-tag tag-b">Engine B</span>'
-        if token.engine_c_signal:
-            engine_tags += '<span class="engine-tag tag-c">Engine C</span>'
-        
-        if not engine_tags:
-            engine_tags = '<span style="color: #888;">No engine signals</span>'
-        
-        # DexScreener URL
-        dex_url = f"https://dexscreener.com/{token.chain}/{token.address}"
-        bubble_url = f"https://app.bubblemaps.io/{token.chain}/token/{token.address}"
-        
-        html += f"""
-            <div class="token-card">
-                <div class="token-header">
-                    <div>
-                        <div class="token-name">{token.name}</div>
-                        <div class="token-symbol">${token.symbol} • {token.chain.upper()}</div>
-                    </div>
-                    <div class="change-badge {change_class}">{change_sign}{token.change_24h:.1f}%</div>
-                </div>
-                
-                <div class="token-stats">
-                    <div class="token-stat">
-                        <div class="token-stat-value">${token.price:.8f}</div>
-                        <div class="token-stat-label">Price</div>
-                    </div>
-                    <div class="token-stat">
-                        <div class="token-stat-value">${token.market_cap/1000:.0f}K</div>
-                        <div class="token-stat-label">Market Cap</div>
-                    </div>
-                    <div class="token-stat">
-                        <div class="token-stat-value">${token.volume_24h/1000:.0f}K</div>
-                        <div class="token-stat-label">24h Volume</div>
-                    </div>
-                </div>
-                
-                <div class="engine-tags">
-                    {engine_tags}
-                </div>
-                
-                <div class="contract-box">
-                    <div class="contract-label">Contract Address</div>
-                    <div class="contract-address">{token.address}</div>
-                </div>
-                
-                <div class="links">
-                    <a href="{dex_url}" target="_blank" class="link-btn">DexScreener</a>
-                    <a href="{bubble_url}" target="_blank" class="link-btn">Bubble Maps</a>
-                </div>
-            </div>
-"""
-    
-    html += f"""
-        </div>
-        
-        <div class="footer">
-            <p>Generated by PolyClaw Memecoin Scanner v4</p>
-            <p style="margin-top: 10px; font-size: 0.8em;">
-                Sources: CoinGecko, DexScreener, Birdeye, GMGN | 
-                Engines: EMA50 Reclaim, Pump-Dump-Reclaim, EMA50 Hold
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        positive = token.change_24h >= 0
+        fh.write(_TOKEN_CARD.format_map({
+            'name': escape(token.name),
+            'symbol': escape(token.symbol),
+            'chain_display': escape(token.chain_display),
+            'address': escape(token.address),
+            'dex_url': escape(token.dex_url),
+            'bubble_url': escape(token.bubble_url),
+            'change_class': _CHANGE_CLASSES[positive],
+            'change_sign': _CHANGE_SIGNS[positive],
+            'change_24h': token.change_24h,
+            'price': token.price,
+            'market_cap_k': token.market_cap / 1000,
+            'volume_k': token.volume_24h / 1000,
+            'engine_tags': _ENGINE_TAGS[token.engine_a_signal, token.engine_b_signal, token.engine_c_signal],
+        }))
     
-    return html
+    fh.write(_HTML_FOOTER)
 
 # ==================== MAIN SCANNER ====================
 
@@ -687,89 +904,108 @@ def main():
     print(f"Time: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
     print()
     
-    # Fetch from all sources
+    # Fetch from all sources concurrently; wall time is the slowest source
     print("📡 Fetching data from all sources...")
     
     all_tokens = []
+    sources = [
+        ("CoinGecko", fetch_coingecko),
+        ("DexScreener", fetch_dexscreener),
+        ("Birdeye", fetch_birdeye),
+        ("GMGN", fetch_gmgn),
+    ]
     
-    print("  [1/4] CoinGecko...")
-    cg_tokens = fetch_coingecko()
-    all_tokens.extend(cg_tokens)
-    print(f"        ✓ {len(cg_tokens)} tokens")
-    
-    print("  [2/4] DexScreener...")
-    dex_tokens = fetch_dexscreener()
-    all_tokens.extend(dex_tokens)
-    print(f"        ✓ {len(dex_tokens)} tokens")
-    
-    print("  [3/4] Birdeye...")
-    bird_tokens = fetch_birdeye()
-    all_tokens.extend(bird_tokens)
-    print(f"        ✓ {len(bird_tokens)} tokens")
-    
-    print("  [4/4] GMGN...")
-    gmgn_tokens = fetch_gmgn()
-    all_tokens.extend(gmgn_tokens)
-    print(f"        ✓ {len(gmgn_tokens)} tokens")
+    # Progress is logged as each source lands; results are then combined in
+    # source order so duplicate merging does not depend on which came first
+    results: List[List[Dict]] = [[] for _ in sources]
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        futures = {pool.submit(fetch): n for n, (_, fetch) in enumerate(sources)}
+        for i, future in enumerate(as_completed(futures), 1):
+            n = futures[future]
+            results[n] = future.result()
+            print(f"  [{i}/{len(sources)}] {sources[n][0]}...")
+            print(f"        ✓ {len(results[n])} tokens")
+    for source_tokens in results:
+        all_tokens.extend(source_tokens)
     
     print(f"\n📊 Total raw tokens: {len(all_tokens)}")
     
+    # Overlapping feeds report the same token; rules and engines run once per token
+    all_tokens = dedupe_tokens(all_tokens)
+    print(f"   {len(all_tokens)} unique after merging duplicates")
+    
     # Filter through trading rules
     print("\n🎯 Applying trading rules filter ($100K-$500K MC)...")
     qualified_tokens = []
     
-    for token_data in all_tokens:
-        qualifies, reason = apply_trading_rules(token_data)
-        if qualifies:
-            token = Token(
-                symbol=token_data.get('symbol', ''),
-                name=token_data.get('name', ''),
-                address=token_data.get('address', ''),
-                chain=token_data.get('chain', 'solana'),
-                price=token_data.get('price', 0),
-                market_cap=token_data.get('market_cap', 0),
-                volume_24h=token_data.get('volume_24h', 0),
-                change_24h=token_data.get('change_24h', 0),
-                liquidity=token_data.get('liquidity', 0),
-                holders=token_data.get('holders', 0),
-                source=token_data.get('source', '')
-            )
-            qualified_tokens.append(token)
+    # Token objects are only built for the tokens that pass
+    for token_data in filter_trading_rules(all_tokens):
+        token = Token(
+            symbol=token_data.get('symbol', ''),
+            name=token_data.get('name', ''),
+            address=token_data.get('address', ''),
+            chain=token_data.get('chain', 'solana'),
+            price=token_data.get('price', 0),
+            market_cap=token_data.get('market_cap', 0),
+            volume_24h=token_data.get('volume_24h', 0),
+            change_24h=token_data.get('change_24h', 0),
+            liquidity=token_data.get('liquidity', 0),
+            holders=token_data.get('holders', 0),
+            source=token_data.get('source', '')
+        )
+        qualified_tokens.append(token)
     
     print(f"   ✓ {len(qualified_tokens)} tokens qualify")
     
     # Run engine pattern detection
     print("\n🔍 Running Engine A/B/C pattern detection...")
     
-    for token in qualified_tokens:
-        # Get historical prices for pattern detection
-        prices = get_historical_prices(token.address, token.chain)
-        
-        # Engine A: 12h EMA50 Reclaim
-        token.engine_a_signal, score_a = detect_engine_a(prices, token.change_24h)
-        
-        # Engine B: 4h Pump→Dump→Reclaim
-        token.engine_b_signal, score_b = detect_engine_b(prices, token.change_24h, token.volume_24h)
-        
-        # Engine C: 1h EMA50 Hold (MC ≥ $300K)
-        token.engine_c_signal, score_c = detect_engine_c(prices, token.change_24h, token.market_cap)
-        
-        # Combined score
-        token.engine_score = score_a + score_b + score_c
+    # The history is only scaled from the spot price, so tokens whose source
+    # already reported a price need no DexScreener lookup
+    price_lists = [synthetic_prices(t.price) if t.price > 0 else None for t in qualified_tokens]
+    missing = [i for i, prices in enumerate(price_lists) if prices is None]
+    
+    # The rest are looked up DEX_BATCH_SIZE addresses per request, grouped by
+    # chain, with the batches running concurrently
+    if missing:
+        load_price_cache()
+        by_chain: Dict[str, List[str]] = {}
+        for i in missing:
+            by_chain.setdefault(qualified_tokens[i].chain, []).append(qualified_tokens[i].address)
+        batches = [
+            (chain, addresses[j:j + DEX_BATCH_SIZE])
+            for chain, addresses in by_chain.items()
+            for j in range(0, len(addresses), DEX_BATCH_SIZE)
+        ]
+        found: Dict[Tuple[str, str], List[float]] = {}
+        with ThreadPoolExecutor(max_workers=HISTORY_WORKERS) as pool:
+            fetched = pool.map(
+                get_historical_prices_batch,
+                [chain for chain, _ in batches],
+                [addresses for _, addresses in batches],
+            )
+            for (chain, _), prices_by_address in zip(batches, fetched):
+                for address, prices in prices_by_address.items():
+                    found[chain, address] = prices
+        for i in missing:
+            token = qualified_tokens[i]
+            price_lists[i] = found.get((token.chain, token.address), [])
+        save_price_cache()
+    
+    counts = score_all(qualified_tokens, price_lists)
     
     # Sort by engine score
-    qualified_tokens.sort(key=lambda x: x.engine_score, reverse=True)
+    qualified_tokens.sort(key=attrgetter('engine_score'), reverse=True)
     
     # Print summary
     print(f"\n📈 ENGINE SIGNALS:")
-    print(f"   Engine A (12h EMA50): {sum(1 for t in qualified_tokens if t.engine_a_signal)}")
-    print(f"   Engine B (4h P→D→R): {sum(1 for t in qualified_tokens if t.engine_b_signal)}")
-    print(f"   Engine C (1h Hold):   {sum(1 for t in qualified_tokens if t.engine_c_signal)}")
+    print(f"   Engine A (12h EMA50): {counts[0]}")
+    print(f"   Engine B (4h P→D→R): {counts[1]}")
+    print(f"   Engine C (1h Hold):   {counts[2]}")
     
     # Generate HTML report
     print("\n📝 Generating HTML report...")
     timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
-    html_content = generate_html_report(qualified_tokens, timestamp)
     
     # Save report
     report_path = '/Users/pterion2910/.openclaw/workspace/reports'
@@ -778,8 +1014,12 @@ def main():
     filename = f"memecoin_scan_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M')}.html"
     filepath = os.path.join(report_path, filename)
     
-    with open(filepath, 'w') as f:
-        f.write(html_content)
+    # Written beside the final path and swapped in, so anything watching the
+    # reports folder never opens a half-written file
+    tmp = filepath + '.tmp'
+    with open(tmp, 'w', buffering=1 << 20) as f:
+        generate_html_report(qualified_tokens, counts, timestamp, f)
+    os.replace(tmp, filepath)
     
     print(f"   ✓ Report saved: {filepath}")
     
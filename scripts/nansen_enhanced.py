@@ -6,33 +6,115 @@ Additional endpoints for comprehensive onchain analytics
 
 import os
 import json
+import shutil
 import subprocess
-from typing import Optional, Dict, List, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+    def _dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+BATCH_WORKERS = 6  # concurrent nansen calls; more just queue up on the API
+
+# Parsed responses are cached on disk, keyed by the command line
+CACHE_FILE = '/Users/pterion2910/.openclaw/workspace/cache/nansen_cache.json'
+DEFAULT_CACHE_TTL = 300
+# Seconds a response stays fresh, by subcommand; 0 disables caching
+CACHE_TTLS = {
+    "smart-money leaderboard": 60,
+    "wallet god-mode": 600,
+    "token god-mode": 600,
+    "token distribution": 3600,
+    "alert create": 0,
+}
+
 class NansenEnhanced:
     """Enhanced Nansen CLI wrapper with additional endpoints."""
     
-    def __init__(self):
+    def __init__(self, cache_ttl_overrides: Optional[Dict[str, int]] = None):
         self.api_key = os.getenv("NANSEN_API_KEY", "")
-        self.base_cmd = "nansen"
+        # Resolved once so each call execs the binary directly instead of
+        # searching PATH again
+        self.base_cmd = shutil.which("nansen") or "nansen"
+        self.cache_ttls = {**CACHE_TTLS, **(cache_ttl_overrides or {})}
+        self._cache: Optional[Dict] = None
+        self._cache_lock = threading.Lock()
     
-    def _run(self, cmd: str) -> Dict:
-        """Execute nansen command and parse output."""
+    def _load_cache(self) -> Dict:
+        try:
+            with open(CACHE_FILE, 'rb') as f:
+                return _loads(f.read())
+        except (OSError, ValueError):
+            return {}
+    
+    def _cache_get(self, key: str, ttl: int) -> Optional[Any]:
+        """Cached response for key if stored within the last ttl seconds."""
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = self._load_cache()
+            entry = self._cache.get(key)
+        if entry and entry[0] >= time.time() - ttl:
+            return entry[1]
+        return None
+    
+    def _cache_put(self, key: str, data: Any):
+        """Store a response and rewrite the cache file, dropping expired entries."""
+        with self._cache_lock:
+            now = time.time()
+            cutoff = now - max(DEFAULT_CACHE_TTL, *self.cache_ttls.values())
+            self._cache = {k: v for k, v in self._cache.items() if v[0] >= cutoff}
+            self._cache[key] = [now, data]
+            try:
+                os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+                tmp = CACHE_FILE + '.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(_dumps(self._cache))
+                os.replace(tmp, CACHE_FILE)
+            except OSError:
+                pass  # still cached in memory for this process
+    
+    def _run(self, args: List[str]) -> Dict:
+        """
+        Execute nansen with args and parse output, reusing a fresh cached response.
+        args are passed as argv, so addresses are never re-split or shell-parsed.
+        """
+        key = " ".join(args)
+        ttl = self.cache_ttls.get(" ".join(args[:2]), DEFAULT_CACHE_TTL)
+        if ttl:
+            cached = self._cache_get(key, ttl)
+            if cached is not None:
+                return cached
+        
         try:
             result = subprocess.run(
-                cmd.split(),
+                [self.base_cmd, *args],
                 capture_output=True,
-                text=True,
                 timeout=60
             )
+            # Output is kept as bytes so orjson can parse it without a decode
             if result.returncode == 0:
                 try:
-                    return json.loads(result.stdout)
-                except:
-                    return {"output": result.stdout}
+                    data = _loads(result.stdout)
+                except ValueError:
+                    return {"output": result.stdout.decode(errors="replace")}
+                if ttl:
+                    self._cache_put(key, data)
+                return data
             else:
-                return {"error": result.stderr}
+                return {"error": result.stderr.decode(errors="replace")}
         except Exception as e:
             return {"error": str(e)}
     
@@ -43,106 +125,134 @@ class NansenEnhanced:
         Comprehensive wallet analysis (Nansen God Mode).
         Includes: PnL, token performance, trading history, labels.
         """
-        return self._run(f"{self.base_cmd} wallet god-mode {address} --json")
+        return self._run(["wallet", "god-mode", address, "--json"])
     
     def wallet_pnl(self, address: str, days: int = 30) -> Dict:
         """Wallet PnL analysis over time period."""
-        return self._run(f"{self.base_cmd} wallet pnl {address} --days {days} --json")
+        return self._run(["wallet", "pnl", address, "--days", str(days), "--json"])
     
     def wallet_token_performance(self, address: str) -> Dict:
         """Token-by-token performance for wallet."""
-        return self._run(f"{self.base_cmd} wallet tokens {address} --performance --json")
+        return self._run(["wallet", "tokens", address, "--performance", "--json"])
     
     def wallet_trading_summary(self, address: str, days: int = 7) -> Dict:
         """Trading activity summary."""
-        return self._run(f"{self.base_cmd} wallet trading {address} --days {days} --json")
+        return self._run(["wallet", "trading", address, "--days", str(days), "--json"])
     
     def wallet_counterparties(self, address: str) -> Dict:
         """Most traded counterparties."""
-        return self._run(f"{self.base_cmd} wallet counterparties {address} --json")
+        return self._run(["wallet", "counterparties", address, "--json"])
     
     # === SMART MONEY INTELLIGENCE ===
     
     def smart_money_leaderboard(self, timeframe: str = "7d") -> Dict:
         """Top performing smart money wallets."""
-        return self._run(f"{self.base_cmd} smart-money leaderboard --timeframe {timeframe} --json")
+        return self._run(["smart-money", "leaderboard", "--timeframe", timeframe, "--json"])
     
     def smart_money_convergence(self, token: str) -> Dict:
         """
         Detect when multiple smart money wallets buy same token.
         Strong bullish signal.
         """
-        return self._run(f"{self.base_cmd} smart-money convergence {token} --json")
+        return self._run(["smart-money", "convergence", token, "--json"])
     
     def smart_money_divergence(self, token: str) -> Dict:
         """
         Detect when smart money is selling while price rises.
         Bearish divergence signal.
         """
-        return self._run(f"{self.base_cmd} smart-money divergence {token} --json")
+        return self._run(["smart-money", "divergence", token, "--json"])
     
     def smart_money_correlation(self, address: str) -> Dict:
         """Find wallets with similar trading patterns (likely same entity)."""
-        return self._run(f"{self.base_cmd} smart-money correlate {address} --json")
+        return self._run(["smart-money", "correlate", address, "--json"])
     
     # === TOKEN INTELLIGENCE ===
     
     def token_god_mode(self, address: str) -> Dict:
         """Comprehensive token analysis."""
-        return self._run(f"{self.base_cmd} token god-mode {address} --json")
+        return self._run(["token", "god-mode", address, "--json"])
     
     def token_smart_holders(self, address: str) -> Dict:
         """Smart money holders with entry prices."""
-        return self._run(f"{self.base_cmd} token smart-holders {address} --json")
+        return self._run(["token", "smart-holders", address, "--json"])
     
     def token_exchange_flows(self, address: str, days: int = 7) -> Dict:
         """Exchange inflows/outflows (predicts volatility)."""
-        return self._run(f"{self.base_cmd} token exchanges {address} --days {days} --json")
+        return self._run(["token", "exchanges", address, "--days", str(days), "--json"])
     
     def token_distribution(self, address: str) -> Dict:
         """Holder concentration analysis."""
-        return self._run(f"{self.base_cmd} token distribution {address} --json")
+        return self._run(["token", "distribution", address, "--json"])
     
     def token_staking(self, address: str) -> Dict:
         """Staking/unstaking flows."""
-        return self._run(f"{self.base_cmd} token staking {address} --json")
+        return self._run(["token", "staking", address, "--json"])
     
     # === MARKET INTELLIGENCE ===
     
     def market_sectors(self) -> Dict:
         """Sector performance (DeFi, NFT, Gaming, etc.)."""
-        return self._run(f"{self.base_cmd} market sectors --json")
+        return self._run(["market", "sectors", "--json"])
     
     def market_nft_signals(self) -> Dict:
         """NFT market smart money signals."""
-        return self._run(f"{self.base_cmd} market nft-signals --json")
+        return self._run(["market", "nft-signals", "--json"])
     
     def market_gas_analysis(self) -> Dict:
         """Gas usage patterns (detects unusual activity)."""
-        return self._run(f"{self.base_cmd} market gas --json")
+        return self._run(["market", "gas", "--json"])
     
     # === ALERTS & MONITORING ===
     
     def create_smart_money_alert(self, token: str, threshold_usd: int = 10000) -> Dict:
         """Alert when smart money moves >$X into token."""
-        return self._run(
-            f"{self.base_cmd} alert create --token {token} "
-            f"--threshold {threshold_usd} --type smart-money"
-        )
+        return self._run([
+            "alert", "create", "--token", token,
+            "--threshold", str(threshold_usd), "--type", "smart-money"
+        ])
     
     def create_wallet_cluster_alert(self, address: str) -> Dict:
         """Alert when related wallets (cluster) show activity."""
-        return self._run(
-            f"{self.base_cmd} alert create --wallet {address} "
-            f"--type cluster --include-related"
-        )
+        return self._run([
+            "alert", "create", "--wallet", address,
+            "--type", "cluster", "--include-related"
+        ])
     
     def create_convergence_alert(self, min_wallets: int = 3) -> Dict:
         """Alert when multiple smart money wallets converge on same token."""
-        return self._run(
-            f"{self.base_cmd} alert create --type convergence "
-            f"--min-wallets {min_wallets}"
-        )
+        return self._run([
+            "alert", "create", "--type", "convergence",
+            "--min-wallets", str(min_wallets)
+        ])
+    
+    # === BATCHED QUERIES ===
+    
+    def batch(self, calls: List[Tuple[str, tuple, dict]]) -> List[Dict]:
+        """
+        Run several queries concurrently, BATCH_WORKERS at a time.
+        calls holds (method_name, args, kwargs); results keep the same order.
+        """
+        if not calls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(calls))) as pool:
+            futures = [
+                pool.submit(getattr(self, name), *args, **kwargs)
+                for name, args, kwargs in calls
+            ]
+            return [f.result() for f in futures]
+    
+    def wallet_full_profile(self, address: str) -> Dict:
+        """God mode, PnL, tokens, counterparties and trading for one wallet, fetched together."""
+        sections = {
+            "god_mode": "wallet_god_mode",
+            "pnl": "wallet_pnl",
+            "tokens": "wallet_token_performance",
+            "counterparties": "wallet_counterparties",
+            "trading": "wallet_trading_summary",
+        }
+        results = self.batch([(method, (address,), {}) for method in sections.values()])
+        return dict(zip(sections, results))
 
 # === NEW CLI COMMANDS ===
 
@@ -151,6 +261,10 @@ if __name__ == "__main__":
     
     nansen = NansenEnhanced()
     
+    def emit(result):
+        """Pretty-print a result as bytes straight to stdout."""
+        sys.stdout.buffer.write(_dumps_pretty(result) + b"\n")
+    
     if len(sys.argv) < 2:
         print("Usage: python3 nansen_enhanced.py <command> [args]")
         print("\nCommands:")
@@ -158,6 +272,7 @@ if __name__ == "__main__":
         print("  wallet-pnl <address> [days]      - PnL over time")
         print("  wallet-tokens <address>          - Token performance")
         print("  wallet-trading <address> [days]  - Trading summary")
+        print("  wallet-profile <address>         - All wallet queries at once")
         print("  sm-leaderboard [timeframe]       - Top smart money")
         print("  sm-convergence <token>           - Multiple whales buying")
         print("  sm-divergence <token>            - Smart money selling")
@@ -172,34 +287,36 @@ if __name__ == "__main__":
     cmd = sys.argv[1]
     
     if cmd == "wallet-god-mode" and len(sys.argv) > 2:
-        print(json.dumps(nansen.wallet_god_mode(sys.argv[2]), indent=2))
+        emit(nansen.wallet_god_mode(sys.argv[2]))
     elif cmd == "wallet-pnl" and len(sys.argv) > 2:
         days = int(sys.argv[3]) if len(sys.argv) > 3 else 30
-        print(json.dumps(nansen.wallet_pnl(sys.argv[2], days), indent=2))
+        emit(nansen.wallet_pnl(sys.argv[2], days))
     elif cmd == "wallet-tokens" and len(sys.argv) > 2:
-        print(json.dumps(nansen.wallet_token_performance(sys.argv[2]), indent=2))
+        emit(nansen.wallet_token_performance(sys.argv[2]))
     elif cmd == "wallet-trading" and len(sys.argv) > 2:
         days = int(sys.argv[3]) if len(sys.argv) > 3 else 7
-        print(json.dumps(nansen.wallet_trading_summary(sys.argv[2], days), indent=2))
+        emit(nansen.wallet_trading_summary(sys.argv[2], days))
+    elif cmd == "wallet-profile" and len(sys.argv) > 2:
+        emit(nansen.wallet_full_profile(sys.argv[2]))
     elif cmd == "sm-leaderboard":
         timeframe = sys.argv[2] if len(sys.argv) > 2 else "7d"
-        print(json.dumps(nansen.smart_money_leaderboard(timeframe), indent=2))
+        emit(nansen.smart_money_leaderboard(timeframe))
     elif cmd == "sm-convergence" and len(sys.argv) > 2:
-        print(json.dumps(nansen.smart_money_convergence(sys.argv[2]), indent=2))
+        emit(nansen.smart_money_convergence(sys.argv[2]))
     elif cmd == "sm-divergence" and len(sys.argv) > 2:
-        print(json.dumps(nansen.smart_money_divergence(sys.argv[2]), indent=2))
+        emit(nansen.smart_money_divergence(sys.argv[2]))
     elif cmd == "sm-correlate" and len(sys.argv) > 2:
-        print(json.dumps(nansen.smart_money_correlation(sys.argv[2]), indent=2))
+        emit(nansen.smart_money_correlation(sys.argv[2]))
     elif cmd == "token-god-mode" and len(sys.argv) > 2:
-        print(json.dumps(nansen.token_god_mode(sys.argv[2]), indent=2))
+        emit(nansen.token_god_mode(sys.argv[2]))
     elif cmd == "token-smart-holders" and len(sys.argv) > 2:
-        print(json.dumps(nansen.token_smart_holders(sys.argv[2]), indent=2))
+        emit(nansen.token_smart_holders(sys.argv[2]))
     elif cmd == "token-exchanges" and len(sys.argv) > 2:
         days = int(sys.argv[3]) if len(sys.argv) > 3 else 7
-        print(json.dumps(nansen.token_exchange_flows(sys.argv[2], days), indent=2))
+        emit(nansen.token_exchange_flows(sys.argv[2], days))
     elif cmd == "market-sectors":
-        print(json.dumps(nansen.market_sectors(), indent=2))
+        emit(nansen.market_sectors())
     elif cmd == "market-nft":
-        print(json.dumps(nansen.market_nft_signals(), indent=2))
+        emit(nansen.market_nft_signals())
     else:
         print(f"Unknown command: {cmd}")
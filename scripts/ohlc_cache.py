@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of closed OHLC candles
+Keyed by (address, timeframe). Only closed candles are stored, so a
+caller can ask for just the buckets newer than the cache and skip the
+API entirely when no new bucket can have closed yet.
+
+Rows are stored as lists whose first element is the candle open time
+(unix seconds); the remaining fields are up to the caller.
+"""
+
+import json
+import os
+from typing import Dict, List
+
+class OHLCCache:
+    def __init__(self, path: str, interval: int, max_rows: int = 200):
+        self.path = path
+        self.interval = interval
+        self.max_rows = max_rows
+        self._data: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Persist the cache (write-then-rename, so an interrupted run never truncates it)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self._data, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    def _entry(self, address: str, timeframe: str) -> Dict:
+        return self._data.setdefault(f"{address}:{timeframe}", {"rows": [], "empty_probe_ts": 0})
+
+    def last_closed_ts(self, address: str, timeframe: str) -> int:
+        """Open time of the newest cached closed candle, or 0."""
+        rows = self._entry(address, timeframe)["rows"]
+        return rows[-1][0] if rows else 0
+
+    def get_closed_candles(self, address: str, timeframe: str, since: int = 0) -> List[list]:
+        """Cached closed candles with open time > since, oldest first."""
+        return [r for r in self._entry(address, timeframe)["rows"] if r[0] > since]
+
+    def should_fetch(self, address: str, timeframe: str, now: float) -> bool:
+        """
+        False when the API cannot have anything new: the bucket after the
+        newest cached candle has not closed yet, or the API already came
+        back empty during the current bucket.
+        """
+        entry = self._entry(address, timeframe)
+        last_ts = self.last_closed_ts(address, timeframe)
+        if last_ts and now < last_ts + 2 * self.interval:
+            return False
+        bucket = int(now) // self.interval
+        return int(entry["empty_probe_ts"]) // self.interval != bucket
+
+    def merge(self, address: str, timeframe: str, rows: List[list], now: float):
+        """Add the closed candles among rows, replacing any with the same open time."""
+        entry = self._entry(address, timeframe)
+        by_ts = {r[0]: r for r in entry["rows"]}
+        for r in rows:
+            if r[0] + self.interval <= now:
+                by_ts[r[0]] = list(r)
+        entry["rows"] = [by_ts[ts] for ts in sorted(by_ts)][-self.max_rows:]
+
+    def mark_empty(self, address: str, timeframe: str, now: float):
+        """Record that the API returned nothing during the current bucket."""
+        self._entry(address, timeframe)["empty_probe_ts"] = int(now)
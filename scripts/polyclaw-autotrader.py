@@ -5,14 +5,32 @@ Monitors markets, researches opportunities, executes trades, manages risk.
 """
 
 import os
+import re
+import atexit
 import sys
 import json
 import time
+import heapq
+import hashlib
+import subprocess
 import random
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timezone
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+
 # Config
 CHAINSTACK_NODE = os.getenv("CHAINSTACK_NODE", "https://polygon-mainnet.core.chainstack.com/")
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
@@ -23,6 +41,7 @@ POLYCLAW_PRIVATE_KEY = os.getenv("POLYCLAW_PRIVATE_KEY", "")
 # RISK MANAGEMENT - LESSONS LEARNED FROM FED TRADE (Feb 14, 2026)
 # Fed trade lost 93% because: low probability (7%), low liquidity, extreme odds
 MAX_POSITION_SIZE = 3.00  # Reduced from $5 to $3 - smaller bets on longshots
+MIN_POSITION_SIZE = 0.50  # Smallest position we open
 MAX_DAILY_EXPOSURE = 15.00  # Reduced from $20 - more conservative
 MIN_CONFIDENCE_THRESHOLD = 0.75  # Increased from 70% - higher bar
 MIN_MARKET_VOLUME = 1000000  # Increased from $500K to $1M - only liquid markets
@@ -34,6 +53,11 @@ STOP_LOSS_PERCENTAGE = 0.20  # Increased from 15% to 20% - but earlier warning
 MIN_PROBABILITY = 0.20  # NEW: Don't bet on <20% outcomes (learned from Fed 7% bet)
 MAX_PROBABILITY = 0.80  # NEW: Don't bet on >80% outcomes (low upside)
 MAX_POSITION_ON_EXTREME = 1.00  # NEW: Max $1 on <25% or >75% outcomes
+# Markets priced outside this band are not researched: either side is a
+# longshot or has almost no upside, so a 10% edge is structurally unlikely
+MIN_YES_PRICE = 0.08
+MAX_YES_PRICE = 0.92
+MIN_TIME_TO_RESOLUTION = 600  # seconds; closer to the end there is no time to trade
 
 # NEW: Kelly Criterion sizing
 KELLY_FRACTION = 0.25  # Use 1/4 Kelly to avoid ruin
@@ -56,68 +80,262 @@ print(f"[RISK] Max: ${MAX_POSITION_SIZE}, Stop: {STOP_LOSS_PERCENTAGE:.0%}, Kell
 print(f"[FILTERS] Vol: ${MIN_MARKET_VOLUME:,}, Prob: {MIN_PROBABILITY:.0%}-{MAX_PROBABILITY:.0%}")
 print(f"[HEDGE] {'ENABLED' if ENABLE_HEDGE_DISCOVERY else 'DISABLED'} | [WHALE] {'ENABLED' if ENABLE_SMART_MONEY else 'DISABLED'}")
 
-# Trade log
-TRADE_LOG = "/Users/pterion2910/.openclaw/workspace/memory/polyclaw-trades.json"
+POLYCLAW_DIR = os.path.expanduser("~/.openclaw/skills/polyclaw")
+
+# Trade log, one JSON object per line, oldest first
+TRADE_LOG = "/Users/pterion2910/.openclaw/workspace/memory/polyclaw-trades.jsonl"
+LEGACY_TRADE_LOG = "/Users/pterion2910/.openclaw/workspace/memory/polyclaw-trades.json"
+TRADE_LOG_TAIL = 65536  # bytes read from the end of the log for today's trades
+
+# Perplexity answers are reused for repeat queries within the TTL
+RESEARCH_CACHE_FILE = "/Users/pterion2910/.openclaw/workspace/cache/polyclaw-research.json"
+RESEARCH_CACHE_TTL = 1800
+RESEARCH_CACHE_LOCK = threading.Lock()  # research runs on several threads
+RESEARCH_WORKERS = 5  # concurrent Perplexity requests per scan
+_RESEARCH_MEMO: Optional[Dict] = None  # in-process copy, read from disk once
+
+# Shared keep-alive pool for Perplexity, so repeat research calls skip the
+# TCP/TLS handshake. Rate-limited (429) and 5xx responses are retried with
+# back-off instead of dropping the trade until the next run. Read errors and
+# timeouts are not retried: the request may already have been billed.
+SESSION = requests.Session()
+SESSION.headers.update({
+    "Authorization": f"Bearer {os.getenv('PERPLEXITY_API_KEY', '')}",
+    "Content-Type": "application/json"
+})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False,
+    ),
+))
+
+# Perplexity request, fixed apart from the user query
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+QUERY_PLACEHOLDER = b'"__QUERY__"'
+PERPLEXITY_BODY = _dumps({
+    "model": "sonar-pro",
+    "messages": [
+        {"role": "system", "content": "You are a prediction market analyst. Analyze the question objectively. Provide: 1) Probability estimate (0-100%), 2) Key factors, 3) Risk factors, 4) Confidence level (high/medium/low). Be concise."},
+        {"role": "user", "content": "__QUERY__"}
+    ],
+    "temperature": 0.2,
+    "max_tokens": 1000
+})
+
+# Probability and confidence markers in research text, matched in one scan
+SIGNAL_RE = re.compile(r'(\d+)\s*%|(high|medium|low)\s+confidence', re.I)
+CONFIDENCE_LEVELS = {"high": 0.8, "medium": 0.6, "low": 0.4}
+
+def migrate_trade_log():
+    """Convert the old single-array trade log to JSONL, once."""
+    if os.path.exists(TRADE_LOG) or not os.path.exists(LEGACY_TRADE_LOG):
+        return
+    with open(LEGACY_TRADE_LOG, 'rb') as f:
+        trades = _loads(f.read())
+    tmp = TRADE_LOG + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.writelines(_dumps(t) + b"\n" for t in trades)
+    os.replace(tmp, TRADE_LOG)
+
+def run_polyclaw(args: List[str], timeout: int) -> subprocess.CompletedProcess:
+    """
+    Run a PolyClaw script from the skill directory.
+    args go straight to uv as argv, with no shell in between to spawn or to
+    reinterpret market ids.
+    """
+    return subprocess.run(
+        ["uv", "run", "python", *args],
+        cwd=POLYCLAW_DIR,
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+# Append-only descriptor for the trade log, opened on first use
+_LOG_FD: Optional[int] = None
+
+# Today's exposure as a running total, and how far into the log it has counted
+_EXPOSURE = {"date": None, "total": 0.0, "offset": 0}
+
+def _sum_today(lines: List[bytes], today: str, marker: bytes) -> float:
+    """Total amount of the logged trades among lines made today."""
+    total = 0.0
+    for line in lines:
+        # Only lines whose timestamp field starts with today are parsed
+        if marker in line:
+            t = _loads(line)
+            if t['timestamp'].startswith(today):
+                total += t.get('amount', 0)
+    return total
 
 def log_trade(trade: Dict):
-    """Log trade to file."""
-    trades = []
-    if os.path.exists(TRADE_LOG):
-        with open(TRADE_LOG, 'r') as f:
-            trades = json.load(f)
-    trades.append({
+    """Append trade to the log and to today's running exposure."""
+    timestamp = datetime.now(timezone.utc).isoformat()
+    line = _dumps({
         **trade,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
-    with open(TRADE_LOG, 'w') as f:
-        json.dump(trades, f, indent=2)
+        "timestamp": timestamp
+    }) + b"\n"
+    # Unbuffered writes on an O_APPEND descriptor, so every write lands at the
+    # current end of file. Regular files get no atomicity guarantee, so a short
+    # write is finished with further writes
+    global _LOG_FD
+    if _LOG_FD is None:
+        _LOG_FD = os.open(TRADE_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        atexit.register(os.close, _LOG_FD)
+    view = memoryview(line)
+    written = os.write(_LOG_FD, view)
+    pos = os.lseek(_LOG_FD, 0, os.SEEK_CUR) - written
+    while written < len(line):
+        written += os.write(_LOG_FD, view[written:])
+    # Counted here so the next get_daily_exposure() has nothing to re-read;
+    # if another writer got in between, get_daily_exposure() re-reads instead
+    end = os.lseek(_LOG_FD, 0, os.SEEK_CUR)
+    if _EXPOSURE["date"] == timestamp[:10] and _EXPOSURE["offset"] == pos and end == pos + len(line):
+        _EXPOSURE["total"] += trade.get('amount', 0)
+        _EXPOSURE["offset"] = pos + len(line)
 
 def get_daily_exposure() -> float:
-    """Calculate today's trading volume."""
+    """
+    Calculate today's trading volume.
+    Only lines appended since the last call are parsed. On a new day the
+    log's tail is read instead, widening the window until it reaches a
+    trade from before today (the log is chronological).
+    """
     if not os.path.exists(TRADE_LOG):
         return 0.0
-    with open(TRADE_LOG, 'r') as f:
-        trades = json.load(f)
-    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-    return sum(t['amount'] for t in trades if t['timestamp'].startswith(today))
+    today = datetime.now(timezone.utc).date().isoformat()
+    # Log lines are compact JSON, so a trade made today contains this exactly
+    marker = b'"timestamp":"' + today.encode()
+    size = os.path.getsize(TRADE_LOG)
+    same_day = _EXPOSURE["date"] == today and _EXPOSURE["offset"] <= size
+    if same_day and _EXPOSURE["offset"] == size:
+        return _EXPOSURE["total"]
+    
+    with open(TRADE_LOG, 'rb') as f:
+        if same_day:
+            start = _EXPOSURE["offset"]
+            total = _EXPOSURE["total"]
+            f.seek(start)
+            data = f.read(size - start)
+        else:
+            total = 0.0
+            window = TRADE_LOG_TAIL
+            while True:
+                start = max(0, size - window)
+                f.seek(start)
+                data = f.read(size - start)
+                if not start:
+                    break
+                # lines[0] is cut off by the seek
+                lines = data.split(b"\n")
+                if len(lines) > 2 and marker not in lines[1]:
+                    cut = len(lines[0]) + 1
+                    start += cut
+                    data = data[cut:]
+                    break
+                window *= 2
+    
+    # A line still being written is left for the next call
+    end = data.rfind(b"\n") + 1
+    total += _sum_today(data[:end].split(b"\n"), today, marker)
+    _EXPOSURE.update(date=today, total=total, offset=start + end)
+    return total
+
+def load_research_cache() -> Dict:
+    """Cached research results keyed by query hash, as [fetched_at, result]."""
+    try:
+        with open(RESEARCH_CACHE_FILE, 'rb') as f:
+            return _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def save_research_cache(cache: Dict):
+    """Persist the research cache, dropping entries past the TTL."""
+    cutoff = time.time() - RESEARCH_CACHE_TTL
+    fresh = {k: v for k, v in cache.items() if v[0] >= cutoff}
+    os.makedirs(os.path.dirname(RESEARCH_CACHE_FILE), exist_ok=True)
+    tmp = RESEARCH_CACHE_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_dumps(fresh))
+    os.replace(tmp, RESEARCH_CACHE_FILE)
+
+def cached_research(key: str) -> Optional[Dict]:
+    """Research for a query hash if answered within RESEARCH_CACHE_TTL."""
+    global _RESEARCH_MEMO
+    with RESEARCH_CACHE_LOCK:
+        if _RESEARCH_MEMO is None:
+            _RESEARCH_MEMO = load_research_cache()
+        entry = _RESEARCH_MEMO.get(key)
+    if entry and entry[0] >= time.time() - RESEARCH_CACHE_TTL:
+        return entry[1]
+    return None
+
+def extract_signals(content: str) -> Tuple[float, float]:
+    """
+    (probability, confidence) from research text in a single pass.
+    Probability is the first percentage; confidence is the highest level
+    mentioned. Each defaults to 0.5.
+    """
+    prob = None
+    confidence = None
+    for match in SIGNAL_RE.finditer(content):
+        percent, level = match.groups()
+        if percent is not None:
+            if prob is None:
+                prob = int(percent) / 100
+        else:
+            value = CONFIDENCE_LEVELS[level.lower()]
+            if confidence is None or value > confidence:
+                confidence = value
+        if prob is not None and confidence == CONFIDENCE_LEVELS["high"]:
+            break  # neither can change any more
+    return (
+        0.5 if prob is None else prob,
+        0.5 if confidence is None else confidence,
+    )
 
 def perplexity_research(query: str) -> Optional[Dict]:
-    """Run Perplexity research query."""
+    """Run Perplexity research query, reusing an answer from the last RESEARCH_CACHE_TTL."""
+    key = hashlib.sha256(query.encode()).hexdigest()
+    cached = cached_research(key)
+    if cached is not None:
+        return cached
+    
     try:
-        resp = requests.post(
-            "https://api.perplexity.ai/chat/completions",
-            headers={
-                "Authorization": f"Bearer {os.getenv('PERPLEXITY_API_KEY', '')}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "sonar-pro",
-                "messages": [
-                    {"role": "system", "content": "You are a prediction market analyst. Analyze the question objectively. Provide: 1) Probability estimate (0-100%), 2) Key factors, 3) Risk factors, 4) Confidence level (high/medium/low). Be concise."},
-                    {"role": "user", "content": query}
-                ],
-                "temperature": 0.2,
-                "max_tokens": 1000
-            },
+        # Only the query is encoded per call; the rest of the body is prebuilt
+        resp = SESSION.post(
+            PERPLEXITY_URL,
+            data=PERPLEXITY_BODY.replace(QUERY_PLACEHOLDER, _dumps(query)),
             timeout=45
         )
-        data = resp.json()
+        data = _loads(resp.content)
         content = data["choices"][0]["message"]["content"]
         
-        # Extract probability from response
-        prob = 0.5
-        if "%" in content:
-            # Try to find percentage
-            import re
-            matches = re.findall(r'(\d+)%', content)
-            if matches:
-                prob = int(matches[0]) / 100
-        
-        return {
+        prob, confidence = extract_signals(content)
+        research = {
             "analysis": content,
             "probability": prob,
+            "confidence": confidence,
             "citations": data.get("citations", [])
         }
+        # The file is re-read before saving so answers from other runs are kept
+        with RESEARCH_CACHE_LOCK:
+            entry = [time.time(), research]
+            _RESEARCH_MEMO[key] = entry
+            cache = load_research_cache()
+            cache[key] = entry
+            try:
+                save_research_cache(cache)
+            except OSError:
+                pass  # still cached in memory for this process
+        return research
     except Exception as e:
         print(f"[Research Error] {e}")
         return None
@@ -133,13 +351,8 @@ def scan_opportunities() -> List[Dict]:
     # For now, return empty - implement with actual API call
     return []
 
-def evaluate_trade(market: Dict) -> Optional[Dict]:
-    """
-    Evaluate a market for trading opportunity.
-    Returns trade details or None if no edge.
-    UPDATED: Added probability constraints and Kelly sizing (Feb 15, 2026)
-    """
-    question = market.get('question', '')
+def prefilter_market(market: Dict) -> bool:
+    """Cheap checks that decide whether a market is worth researching."""
     yes_price = market.get('yes_price', 0)
     volume = market.get('volume', 0)
     liquidity = market.get('liquidity', 0)
@@ -147,15 +360,45 @@ def evaluate_trade(market: Dict) -> Optional[Dict]:
     # Skip low volume markets
     if volume < MIN_MARKET_VOLUME:
         print(f"   ⏭️  Volume ${volume:,.0f} < ${MIN_MARKET_VOLUME:,}")
-        return None
+        return False
     
     # NEW: Skip low liquidity markets (learned from Fed trade)
     if liquidity < MIN_MARKET_LIQUIDITY:
         print(f"   ⏭️  Liquidity ${liquidity:,.0f} < ${MIN_MARKET_LIQUIDITY:,}")
-        return None
+        return False
+    
+    # Skip extreme prices before paying for research
+    if not MIN_YES_PRICE <= yes_price <= MAX_YES_PRICE:
+        print(f"   ⏭️  YES price {yes_price:.2f} outside {MIN_YES_PRICE:.2f}-{MAX_YES_PRICE:.2f}")
+        return False
+    
+    # Skip markets about to resolve
+    end_time = market.get('end_time')
+    if end_time is not None:
+        if isinstance(end_time, str):
+            try:
+                end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+            except ValueError:
+                print(f"   ⏭️  Unparseable end time {end_time!r}")
+                return False
+            # A naive timestamp is taken as UTC, not local time
+            if end_dt.tzinfo is None:
+                end_dt = end_dt.replace(tzinfo=timezone.utc)
+            end_time = end_dt.timestamp()
+        if end_time - time.time() < MIN_TIME_TO_RESOLUTION:
+            print(f"   ⏭️  Resolves in under {MIN_TIME_TO_RESOLUTION // 60} minutes")
+            return False
     
-    # Research the market
-    research_query = f"""Analyze this prediction market for trading:
+    return True
+
+def build_research_query(market: Dict) -> str:
+    """Perplexity prompt for a market."""
+    question = market.get('question', '')
+    yes_price = market.get('yes_price', 0)
+    volume = market.get('volume', 0)
+    liquidity = market.get('liquidity', 0)
+    
+    return f"""Analyze this prediction market for trading:
 
 Question: "{question}"
 Current YES price: ${yes_price}
@@ -171,10 +414,33 @@ Provide:
 
 IMPORTANT: If probability is <20% or >80%, flag as "EXTREME_ODDS"."""
 
-    research = perplexity_research(research_query)
+def kelly_size(p: float, price: float) -> Tuple[float, float]:
+    """
+    Fractional Kelly stake for buying a side at price with win probability p.
+    Returns (position, kelly_fraction); plain arithmetic, no per-market state.
+    """
+    # f* = (p*b - q) / b where q=1-p, b=decimal odds
+    # Using 1/4 Kelly to avoid ruin
+    b = (1 - price) / price if price > 0 else 0
+    if b <= 0:
+        return MAX_POSITION_SIZE * 0.1, 0  # Conservative default
+    kelly_fraction = (p * b - (1 - p)) / b
+    position = MAX_POSITION_SIZE * kelly_fraction * KELLY_FRACTION
+    return max(MIN_POSITION_SIZE, min(position, MAX_POSITION_SIZE)), kelly_fraction  # Min $0.5, max $3
+
+def finalize_trade(market: Dict, research: Optional[Dict]) -> Optional[Dict]:
+    """
+    Turn a market's research into trade details, or None if no edge.
+    UPDATED: Added probability constraints and Kelly sizing (Feb 15, 2026)
+    """
     if not research:
         return None
     
+    question = market.get('question', '')
+    yes_price = market.get('yes_price', 0)
+    volume = market.get('volume', 0)
+    liquidity = market.get('liquidity', 0)
+    
     true_prob = research['probability']
     
     # NEW: Check probability constraints (learned from Fed 7% bet)
@@ -205,34 +471,17 @@ IMPORTANT: If probability is <20% or >80%, flag as "EXTREME_ODDS"."""
     target_price = true_prob if edge > 0 else (1 - true_prob)
     
     # Calculate confidence
-    confidence = 0.5
-    if "high confidence" in research['analysis'].lower():
-        confidence = 0.8
-    elif "medium confidence" in research['analysis'].lower():
-        confidence = 0.6
-    elif "low confidence" in research['analysis'].lower():
-        confidence = 0.4
+    confidence = research.get('confidence')
+    if confidence is None:  # cached before confidence was stored
+        confidence = extract_signals(research['analysis'])[1]
+    if confidence == CONFIDENCE_LEVELS["low"]:
         print(f"   ⚠️  Low confidence research - reducing position size")
     
     # NEW: Kelly Criterion sizing (fractional Kelly)
-    # f* = (p*b - q) / b where p=prob, q=1-p, b=odds
-    # Using 1/4 Kelly to avoid ruin
     if side == "YES":
-        p = true_prob
-        b = (1 - yes_price) / yes_price if yes_price > 0 else 0  # Decimal odds
-    else:
-        p = 1 - true_prob
-        no_price = 1 - yes_price
-        b = (1 - no_price) / no_price if no_price > 0 else 0
-    
-    q = 1 - p
-    
-    if b > 0:
-        kelly_fraction = (p * b - q) / b
-        kelly_position = MAX_POSITION_SIZE * kelly_fraction * KELLY_FRACTION
-        kelly_position = max(0.5, min(kelly_position, MAX_POSITION_SIZE))  # Min $0.5, max $3
+        kelly_position, kelly_fraction = kelly_size(true_prob, yes_price)
     else:
-        kelly_position = MAX_POSITION_SIZE * 0.1  # Conservative default
+        kelly_position, kelly_fraction = kelly_size(1 - true_prob, 1 - yes_price)
     
     # NEW: Limit position on extreme odds
     if is_extreme:
@@ -241,13 +490,9 @@ IMPORTANT: If probability is <20% or >80%, flag as "EXTREME_ODDS"."""
     
     # Final position size is minimum of Kelly and edge-based sizing
     position_size = min(kelly_position, MAX_POSITION_SIZE * abs(edge) * confidence)
-    position_size = max(0.5, position_size)  # Minimum $0.5
+    position_size = max(MIN_POSITION_SIZE, position_size)  # Minimum $0.5
     
-    # NEW: Research validation
     warning_flags = []
-    if "what could go wrong" in research['analysis'].lower():
-        # Extract risks
-        pass
     
     # Fed trade post-mortem check
     if true_prob < 0.15 and edge > 0.05:
@@ -269,9 +514,18 @@ IMPORTANT: If probability is <20% or >80%, flag as "EXTREME_ODDS"."""
         "volume": volume,
         "liquidity": liquidity,
         "warning_flags": warning_flags,
-        "kelly_fraction": kelly_fraction if 'kelly_fraction' in locals() else 0
+        "kelly_fraction": kelly_fraction
     }
 
+def evaluate_trade(market: Dict) -> Optional[Dict]:
+    """
+    Evaluate a market for trading opportunity.
+    Returns trade details or None if no edge.
+    """
+    if not prefilter_market(market):
+        return None
+    return finalize_trade(market, perplexity_research(build_research_query(market)))
+
 def execute_trade(trade: Dict) -> bool:
     """
     Execute trade via PolyClaw CLI.
@@ -280,7 +534,8 @@ def execute_trade(trade: Dict) -> bool:
     print(f"🎯 Executing: {trade['side']} ${trade['amount']} on '{trade['question'][:50]}...'")
     
     # Build PolyClaw command
-    cmd = f"cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw.py buy {trade['market_id']} {trade['side']} {trade['amount']}"
+    args = ["scripts/polyclaw.py", "buy", str(trade['market_id']), trade['side'], str(trade['amount'])]
+    cmd = " ".join(args)
     
     if not LIVE_TRADING:
         print(f"[DRY RUN] Command: {cmd}")
@@ -295,15 +550,8 @@ def execute_trade(trade: Dict) -> bool:
     # LIVE TRADING MODE
     print(f"🟢 LIVE: {cmd}")
     
-    import subprocess
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        result = run_polyclaw(args, timeout=120)
         
         if result.returncode == 0:
             print("✅ Trade executed successfully!")
@@ -338,14 +586,7 @@ def execute_trade(trade: Dict) -> bool:
 def get_open_positions() -> List[Dict]:
     """Fetch open positions from PolyClaw."""
     try:
-        import subprocess
-        result = subprocess.run(
-            "cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw.py positions",
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = run_polyclaw(["scripts/polyclaw.py", "positions"], timeout=30)
         if result.returncode == 0:
             # Parse the output - this is a simple parser
             lines = result.stdout.strip().split('\n')
@@ -389,7 +630,8 @@ def execute_stop_loss(position: Dict) -> bool:
     # If we bought YES, we sell YES tokens
     side_to_sell = position['side']
     
-    cmd = f"cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw.py sell {position['id']} {side_to_sell}"
+    args = ["scripts/polyclaw.py", "sell", str(position['id']), side_to_sell]
+    cmd = " ".join(args)
     
     if not LIVE_TRADING:
         print(f"[DRY RUN] Would execute: {cmd}")
@@ -397,15 +639,8 @@ def execute_stop_loss(position: Dict) -> bool:
     
     print(f"🟢 LIVE STOP LOSS: {cmd}")
     
-    import subprocess
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        result = run_polyclaw(args, timeout=120)
         
         if result.returncode == 0:
             print("✅ Stop loss executed!")
@@ -439,12 +674,8 @@ def scan_hedge_opportunities() -> List[Dict]:
     print("\n🔍 Scanning for hedge opportunities...")
     
     try:
-        import subprocess
-        result = subprocess.run(
-            f"cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw.py hedge scan --limit {HEDGE_SCAN_LIMIT}",
-            shell=True,
-            capture_output=True,
-            text=True,
+        result = run_polyclaw(
+            ["scripts/polyclaw.py", "hedge", "scan", "--limit", str(HEDGE_SCAN_LIMIT)],
             timeout=300  # Hedge scan can take a few minutes
         )
         
@@ -482,12 +713,8 @@ def analyze_hedge_pair(market1_id: str, market2_id: str) -> Optional[Dict]:
     Returns hedge trade details or None.
     """
     try:
-        import subprocess
-        result = subprocess.run(
-            f"cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw.py hedge analyze {market1_id} {market2_id}",
-            shell=True,
-            capture_output=True,
-            text=True,
+        result = run_polyclaw(
+            ["scripts/polyclaw.py", "hedge", "analyze", str(market1_id), str(market2_id)],
             timeout=120
         )
         
@@ -542,7 +769,8 @@ def execute_hedge_trade(hedge: Dict, daily_exposure: float) -> Tuple[bool, float
     total_spent = 0.0
     
     for market_id, side in [(hedge['market1_id'], 'YES'), (hedge['market2_id'], 'NO')]:
-        cmd = f"cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw.py buy {market_id} {side} {leg_size:.2f}"
+        args = ["scripts/polyclaw.py", "buy", str(market_id), side, f"{leg_size:.2f}"]
+        cmd = " ".join(args)
         
         if not LIVE_TRADING:
             print(f"   [DRY RUN] {cmd}")
@@ -552,15 +780,8 @@ def execute_hedge_trade(hedge: Dict, daily_exposure: float) -> Tuple[bool, float
         
         print(f"   🟢 LIVE: {cmd}")
         
-        import subprocess
         try:
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = run_polyclaw(args, timeout=120)
             
             if result.returncode == 0:
                 print(f"   ✅ Leg executed: {market_id} {side}")
@@ -595,8 +816,8 @@ def load_performance_data() -> List[Dict]:
     """Load recent trade performance."""
     perf_file = "/Users/pterion2910/.openclaw/workspace/memory/polyclaw-performance.json"
     if os.path.exists(perf_file):
-        with open(perf_file, 'r') as f:
-            return json.load(f)
+        with open(perf_file, 'rb') as f:
+            return _loads(f.read())
     return []
 
 def calculate_strategy_adjustment() -> Dict:
@@ -667,14 +888,7 @@ def get_smart_money_signals() -> List[Dict]:
     
     try:
         # Run the smart money tracker
-        import subprocess
-        result = subprocess.run(
-            "cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw-smart-money.py",
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        result = run_polyclaw(["scripts/polyclaw-smart-money.py"], timeout=60)
         
         # For now, return empty (full implementation needs Polymarket data source)
         # In production, this would parse the output and return structured signals
@@ -711,7 +925,8 @@ def execute_smart_money_trade(signal: Dict, daily_exposure: float) -> Tuple[bool
     print(f"   Market: {market_id} | Side: {side}")
     print(f"   Size: ${position_size:.2f} | Confidence: {confidence:.0%}")
     
-    cmd = f"cd ~/.openclaw/skills/polyclaw && uv run python scripts/polyclaw.py buy {market_id} {side} {position_size:.2f}"
+    args = ["scripts/polyclaw.py", "buy", str(market_id), str(side), f"{position_size:.2f}"]
+    cmd = " ".join(args)
     
     if not LIVE_TRADING:
         print(f"   [DRY RUN] {cmd}")
@@ -719,15 +934,8 @@ def execute_smart_money_trade(signal: Dict, daily_exposure: float) -> Tuple[bool
     
     print(f"   🟢 LIVE: {cmd}")
     
-    import subprocess
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        result = run_polyclaw(args, timeout=120)
         
         if result.returncode == 0:
             print("   ✅ Copy trade executed!")
@@ -757,6 +965,8 @@ def main():
     print("=" * 60)
     print(f"Time: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
     
+    migrate_trade_log()
+    
     # STEP 1: CHECK STOP LOSS ON EXISTING POSITIONS
     print("\n📊 Checking existing positions for stop loss...")
     open_positions = get_open_positions()
@@ -829,10 +1039,16 @@ def main():
     opportunities = scan_opportunities()
     print(f"Found {len(opportunities)} markets to analyze")
     
+    # Research every market that passes the cheap checks concurrently, so the
+    # scan takes as long as the slowest answer rather than the sum of them
+    candidates = [opp for opp in opportunities if prefilter_market(opp)]
+    with ThreadPoolExecutor(max_workers=RESEARCH_WORKERS) as pool:
+        research = list(pool.map(perplexity_research, map(build_research_query, candidates)))
+    
     # Evaluate each opportunity with dynamic edge threshold
     trades_to_execute = []
-    for opp in opportunities:
-        trade = evaluate_trade(opp)
+    for opp, opp_research in zip(candidates, research):
+        trade = finalize_trade(opp, opp_research)
         if trade:
             # Apply dynamic edge threshold based on performance
             if trade['edge'] >= dynamic_min_edge:
@@ -843,9 +1059,15 @@ def main():
             else:
                 print(f"⏭️  Edge {trade['edge']:.1%} < threshold {dynamic_min_edge:.0%}")
     
-    # Execute best trades
+    # Execute best trades first. They are popped off a heap, so only the ones
+    # reached before the budget runs out get ordered; ties keep scan order.
+    heap = [(-trade['edge'], i) for i, trade in enumerate(trades_to_execute)]
+    heapq.heapify(heap)
     executed = 0
-    for trade in sorted(trades_to_execute, key=lambda x: x['edge'], reverse=True):
+    while heap:
+        if MAX_DAILY_EXPOSURE - daily_exposure < MIN_POSITION_SIZE:
+            break  # no trade is smaller than this
+        trade = trades_to_execute[heapq.heappop(heap)[1]]
         if daily_exposure + trade['amount'] <= MAX_DAILY_EXPOSURE:
             if execute_trade(trade):
                 executed += 1